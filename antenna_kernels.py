@@ -0,0 +1,251 @@
+"""Numeric kernels for geometry analysis and visualization.
+
+The kernels are compiled with Numba when it is installed. Without Numba the
+same functions run as ordinary Python/NumPy code, so Numba stays an optional
+speed-up rather than a dependency.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# ASCII codes used on uint8 character canvases
+SPACE = ord(' ')
+TRACE = ord('#')
+CROSSING = ord('+')
+
+# Overdraw count (0, 1, 2+) -> ASCII code lookup
+OVERDRAW_CHARS = np.array([SPACE, TRACE, CROSSING], dtype=np.uint8)
+
+# Below this many segments plain NumPy beats spinning up parallel threads
+PARALLEL_MIN_SEGMENTS = 100_000
+
+
+@njit(cache=True)
+def draw_line(counts, x1, y1, x2, y2):
+    """Draw one line on a uint8 overdraw-count canvas using Bresenham's algorithm.
+
+    Each visited cell is incremented, saturating at 2 (crossing). Points
+    outside the canvas are skipped. Horizontal and vertical lines are
+    written as a single slice update.
+    """
+    height, width = counts.shape
+
+    # Meander traces are almost always axis-aligned: bump a clipped row or
+    # column slice directly and only walk Bresenham for diagonals
+    if x1 == x2:
+        if 0 <= x1 < width:
+            lo = max(min(y1, y2), 0)
+            hi = min(max(y1, y2), height - 1)
+            if lo <= hi:
+                run = counts[lo:hi + 1, x1]
+                run[:] = np.minimum(run + 1, 2)
+        return
+    if y1 == y2:
+        if 0 <= y1 < height:
+            lo = max(min(x1, x2), 0)
+            hi = min(max(x1, x2), width - 1)
+            if lo <= hi:
+                run = counts[y1, lo:hi + 1]
+                run[:] = np.minimum(run + 1, 2)
+        return
+
+    dx = abs(x2 - x1)
+    dy = abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx - dy
+
+    x, y = x1, y1
+    while True:
+        if 0 <= x < width and 0 <= y < height:
+            counts[y, x] = min(counts[y, x] + 1, 2)
+        if x == x2 and y == y2:
+            break
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x += sx
+        if e2 < dx:
+            err += dx
+            y += sy
+
+
+@njit(cache=True)
+def rasterize_segments(points, counts):
+    """Draw every (px1, py1, px2, py2) row of an integer array onto the count canvas."""
+    for i in range(points.shape[0]):
+        draw_line(counts, points[i, 0], points[i, 1], points[i, 2], points[i, 3])
+
+
+def counts_to_chars(counts):
+    """Map an overdraw-count canvas to ASCII codes: 0 -> ' ', 1 -> '#', 2+ -> '+'."""
+    return OVERDRAW_CHARS[np.minimum(counts, 2)]
+
+
+@njit(parallel=True, cache=True)
+def count_horizontal(coords):
+    """Count (x1, y1, x2, y2, ...) rows whose x extent exceeds their y extent."""
+    horizontal = 0
+    for i in prange(coords.shape[0]):
+        if abs(coords[i, 2] - coords[i, 0]) > abs(coords[i, 3] - coords[i, 1]):
+            horizontal += 1
+    return horizontal
+
+
+# Trace width classification codes (see classify_widths)
+WIDTH_GOOD = 0
+WIDTH_WARNING = 1
+WIDTH_ERROR = 2
+
+
+@njit(cache=True)
+def _classify_widths_jit(widths_mils):
+    codes = np.empty(widths_mils.shape[0], dtype=np.int8)
+    for i in range(widths_mils.shape[0]):
+        w = widths_mils[i]
+        # Branchless: widths vary per trace, so comparisons beat an if/elif ladder
+        error = w < 5.0
+        codes[i] = error * WIDTH_ERROR + (not error and (w < 8.0) | (w > 50.0)) * WIDTH_WARNING
+    return codes
+
+
+def classify_widths(widths_mils):
+    """Classify trace widths in mils: < 5 error, < 8 or > 50 warning, else good.
+
+    Returns an int8 array of WIDTH_* codes, computed with comparison
+    arithmetic rather than per-trace branches.
+    """
+    if NUMBA_AVAILABLE:
+        return _classify_widths_jit(widths_mils)
+    error = widths_mils < 5.0
+    warning = ((widths_mils < 8.0) | (widths_mils > 50.0)) & ~error
+    return error.astype(np.int8) * np.int8(WIDTH_ERROR) + warning.astype(np.int8) * np.int8(WIDTH_WARNING)
+
+
+@njit(cache=True)
+def _segment_extents_jit(segments):
+    min_x = max_x = segments[0, 0]
+    min_y = max_y = segments[0, 1]
+    min_radius = segments[0, 4]
+    total_length = 0.0
+    for i in range(segments.shape[0]):
+        x1, y1, x2, y2, radius = segments[i, 0], segments[i, 1], segments[i, 2], segments[i, 3], segments[i, 4]
+        min_x = min(min_x, x1, x2)
+        max_x = max(max_x, x1, x2)
+        min_y = min(min_y, y1, y2)
+        max_y = max(max_y, y1, y2)
+        min_radius = min(min_radius, radius)
+        total_length += np.hypot(x2 - x1, y2 - y1)
+    return min_x, min_y, max_x, max_y, total_length, min_radius
+
+
+def segment_extents(segments):
+    """Bounds, total length and smallest radius of an (N, 5) segment array.
+
+    Returns (min_x, min_y, max_x, max_y, total_length, min_radius) as floats,
+    computed in one fused pass when Numba is available. N must be >= 1.
+    """
+    if NUMBA_AVAILABLE:
+        return tuple(float(v) for v in _segment_extents_jit(segments))
+    xs = segments[:, [0, 2]]
+    ys = segments[:, [1, 3]]
+    lengths = np.hypot(segments[:, 2] - segments[:, 0], segments[:, 3] - segments[:, 1])
+    return (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()),
+            float(lengths.sum()), float(segments[:, 4].min()))
+
+
+@njit(cache=True)
+def _total_length_jit(coords):
+    total = 0.0
+    for i in range(coords.shape[0]):
+        total += np.hypot(coords[i, 2] - coords[i, 0], coords[i, 3] - coords[i, 1])
+    return total
+
+
+def total_length(coords):
+    """Sum of segment lengths for an (N, 4) array of x1, y1, x2, y2 rows.
+
+    Segment lengths use hypot (one call, no overflow in the squares). The
+    Numba kernel accumulates in row order, matching a plain Python loop; the
+    NumPy fallback sums pairwise and may differ in the last bits.
+    """
+    if NUMBA_AVAILABLE:
+        return float(_total_length_jit(coords))
+    return float(np.hypot(coords[:, 2] - coords[:, 0], coords[:, 3] - coords[:, 1]).sum())
+
+
+@njit(cache=True)
+def _vswr_jit(gammas):
+    out = np.empty(gammas.shape[0], dtype=np.float64)
+    for i in range(gammas.shape[0]):
+        m = abs(gammas[i])
+        out[i] = np.inf if m >= 1.0 else (1.0 + m) / (1.0 - m)
+    return out
+
+
+def vswr_from_reflection(gammas):
+    """VSWR for a 1-D complex array of reflection coefficients (|Γ| >= 1 -> inf).
+
+    Compiled without fastmath: total reflections must come out as inf.
+    Numba's complex abs can differ from NumPy's in the last bit, so the two
+    paths agree to rounding rather than bit for bit.
+    """
+    if NUMBA_AVAILABLE:
+        return _vswr_jit(gammas)
+    mag = np.abs(gammas)
+    with np.errstate(divide='ignore'):
+        return np.where(mag >= 1.0, np.inf, (1.0 + mag) / (1.0 - mag))
+
+
+# Wire orientation codes (see wire_directions)
+WIRE_HORIZONTAL = 0
+WIRE_VERTICAL = 1
+WIRE_DIAGONAL = 2
+
+# Offsets below this count as axis-aligned
+AXIS_TOLERANCE = 0.01
+
+
+@njit(cache=True)
+def _wire_directions_jit(coords):
+    lengths = np.empty(coords.shape[0], dtype=np.float64)
+    directions = np.empty(coords.shape[0], dtype=np.int8)
+    for i in range(coords.shape[0]):
+        dx = coords[i, 2] - coords[i, 0]
+        dy = coords[i, 3] - coords[i, 1]
+        lengths[i] = np.hypot(dx, dy)
+        if abs(dy) < AXIS_TOLERANCE:
+            directions[i] = WIRE_HORIZONTAL
+        elif abs(dx) < AXIS_TOLERANCE:
+            directions[i] = WIRE_VERTICAL
+        else:
+            directions[i] = WIRE_DIAGONAL
+    return lengths, directions
+
+
+def wire_directions(coords):
+    """Length and orientation of each row of an (N, 4) x1, y1, x2, y2 array.
+
+    Returns (lengths, directions): float64 lengths and int8 WIRE_* codes.
+    Compiled without fastmath so the tolerance comparisons and hypot match
+    the NumPy fallback exactly.
+    """
+    if NUMBA_AVAILABLE:
+        return _wire_directions_jit(coords)
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    directions = np.where(np.abs(dy) < AXIS_TOLERANCE, WIRE_HORIZONTAL,
+                          np.where(np.abs(dx) < AXIS_TOLERANCE, WIRE_VERTICAL, WIRE_DIAGONAL))
+    return np.hypot(dx, dy), directions.astype(np.int8)
@@ -6,14 +6,95 @@ calculated antenna lengths, including theoretical electrical lengths vs actual
 meandered trace lengths within substrate constraints.
 """
 
-import matplotlib.pyplot as plt
+import matplotlib
+from matplotlib.figure import Figure
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+import copy
+import functools
 import math
+import re
 from loguru import logger
 
 from presets import BandPresets, FrequencyBand
 from design import AdvancedMeanderTrace
+from antenna_kernels import total_length
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+INCHES_TO_M = 0.0254
+
+# Rows of the (3, N) electrical_lengths array: λ/4, λ/2, λ
+ELECTRICAL_LENGTH_FRACTIONS = np.array([0.25, 0.5, 1.0])
+
+# Charts are bars and straight trend lines, so aggressive path simplification is not
+# visible. Applied only while a chart is saved, never to the global rcParams.
+CHART_RC_PARAMS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+# Chart resolution; screen-sized by default, pass dpi=EXPORT_CHART_DPI for print-quality output
+DEFAULT_CHART_DPI = 150
+EXPORT_CHART_DPI = 300
+
+# Above this many bands the trend scatter is drawn without per-point labels
+MAX_SCATTER_ANNOTATIONS = 15
+
+# Figures reused across chart calls, keyed by (rows, cols, figsize). Charts are
+# generated one at a time on the UI thread, so the pool is not locked.
+_FIGURE_POOL: Dict[tuple, Figure] = {}
+
+
+def _pooled_subplots(rows: int, cols: int, figsize: tuple):
+    """Return a cleared pooled figure with a fresh rows x cols grid of axes.
+
+    Reusing the figure (and its Agg canvas) avoids rebuilding them for every
+    chart. The figures are not registered with pyplot.
+    """
+    key = (rows, cols, tuple(figsize))
+    fig = _FIGURE_POOL.get(key)
+    if fig is None:
+        fig = _FIGURE_POOL[key] = Figure(figsize=figsize)
+    else:
+        fig.clf()
+    return fig, fig.subplots(rows, cols)
+
+
+def _save_pooled_figure(fig: Figure, save_path: str, dpi: int) -> None:
+    """Render a pooled figure to save_path under CHART_RC_PARAMS, then clear it for reuse."""
+    fig.tight_layout()
+    with matplotlib.rc_context(CHART_RC_PARAMS):
+        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    fig.clf()  # Drop the artists; the figure stays pooled for the next chart
+
+
+class BandChartArrays(NamedTuple):
+    """Per-band comparison chart values, one entry per band (structure of arrays)."""
+    labels: List[str]        # "f1/f2/f3 MHz" tick labels
+    short_labels: List[str]  # "f1/f2/f3" scatter annotations
+    band_types: List[str]
+    center_mhz: np.ndarray
+    max_trace_mm: np.ndarray
+    max_half_mm: np.ndarray
+    has_lengths: np.ndarray  # bool: band has both half-wave and trace lengths
+    mean_ratio: np.ndarray
+    all_ratios: np.ndarray   # every meandering ratio of every band, flattened
+
+
+# One GW card (GW tag segs x1 y1 z1 x2 y2 z2 ...), capturing x1 y1 x2 y2. Whitespace
+# excludes newlines so a match never runs into the next card.
+_GW_CARD = re.compile(r'^[^\S\n]*GW\S*[^\S\n]+\S+[^\S\n]+\S+[^\S\n]+(\S+)[^\S\n]+(\S+)'
+                      r'[^\S\n]+\S+[^\S\n]+(\S+)[^\S\n]+(\S+)', re.MULTILINE)
+
+
+# Meander generation settings used for every band length estimate
+MEANDER_CONSTRAINTS = {
+    'substrate_epsilon': 4.3,
+    'substrate_thickness': 0.0016,
+    'coupling_factor': 0.90,
+    'trace_width': 0.001,
+}
 
 
 class BandAnalysisChart:
@@ -31,11 +112,13 @@ class BandAnalysisChart:
 
         logger.info(f"BandAnalysisChart initialized for {substrate_width}x{substrate_height} inch substrate")
 
-    def calculate_band_lengths(self, frequency_band: FrequencyBand) -> Dict[str, Any]:
+    def calculate_band_lengths(self, frequency_band: FrequencyBand, fast: bool = False) -> Dict[str, Any]:
         """Calculate antenna lengths for a frequency band using meandering algorithms.
 
         Args:
             frequency_band: FrequencyBand from presets
+            fast: Skip multi-band meander generation and use the per-frequency
+                target length estimates instead (quicker, less accurate)
 
         Returns:
             dict: Length calculations including theoretical and meandered lengths
@@ -46,170 +129,229 @@ class BandAnalysisChart:
 
             logger.info(f"Calculating lengths for {frequency_band.name}: {frequencies_mhz} MHz")
 
-            # Calculate theoretical electrical lengths (quarter-wave, half-wave, full-wave)
-            electrical_lengths_quarter = []  # λ/4
-            electrical_lengths_half = []     # λ/2
-            electrical_lengths_full = []     # λ
-
-            c = 299792458  # Speed of light in m/s
-            inches_to_m = 0.0254
-
-            for freq_mhz in frequencies_mhz:
-                freq_hz = freq_mhz * 1e6
-                wavelength_m = c / freq_hz
-
-                # Calculate electrical lengths in inches
-                lambda_quarter = (wavelength_m / 4) / inches_to_m       # λ/4 (inches)
-                lambda_half = (wavelength_m / 2) / inches_to_m          # λ/2 (inches)
-                lambda_full = wavelength_m / inches_to_m                # λ (inches)
-
-                electrical_lengths_quarter.append(lambda_quarter)
-                electrical_lengths_half.append(lambda_half)
-                electrical_lengths_full.append(lambda_full)
-
-            # Calculate actual meandered trace lengths using AdvancedMeanderTrace
-            # This uses the same algorithms as the design generator
-            trace_lengths = []
-            meandering_ratios = []
-            substrate_utilizations = []
-
-            # Use multi-band meander generation for accurate length calculation
-            constraints = {
-                'substrate_epsilon': 4.3,
-                'substrate_thickness': 0.0016,
-                'coupling_factor': 0.90,
-                'trace_width': 0.001,
-            }
-
-            multi_result = self.advanced_meander.generate_multi_band_meanders(frequencies_mhz, constraints)
-
-            if multi_result.get('combined_geometry'):
-                # Extract actual trace length from generated geometry
-                geometry = multi_result['combined_geometry']
-                total_trace_length = self._calculate_geometry_trace_length(geometry)
-
-                # For multi-band designs, distribute the total length across frequencies
-                avg_trace_length = total_trace_length / len(frequencies_mhz)
-                trace_lengths = [avg_trace_length] * len(frequencies_mhz)
-
-                # Calculate meandering ratio for each frequency
-                for i, freq_mhz in enumerate(frequencies_mhz):
-                    # Target electrical length (half-wave dipole equivalent)
-                    target_electrical = electrical_lengths_half[i]
-                    actual_trace = trace_lengths[i]
-                    ratio = actual_trace / target_electrical if target_electrical > 0 else 1.0
-                    meandering_ratios.append(ratio)
-
-                    # Substrate utilization estimate
-                    substrate_area = self.substrate_width * self.substrate_height
-                    utilization = (actual_trace * 0.002) / substrate_area * 100  # Rough estimate
-                    substrate_utilizations.append(min(100, utilization))
-
-            else:
-                # Fallback: Estimate trace lengths individually
-                logger.warning("Multi-band geometry generation failed, using individual estimates")
-                for i, freq_mhz in enumerate(frequencies_mhz):
-                    # Estimate trace length using the same algorithm as advanced meander
-                    target_length = self.advanced_meander.extract_target_length(freq_mhz)
-                    trace_lengths.append(target_length)
-
-                    # Meandering ratio (actual should be higher than electrical)
-                    electrical_half = electrical_lengths_half[i]
-                    meandering_ratio = target_length / electrical_half if electrical_half > 0 else 1.0
-                    meandering_ratios.append(meandering_ratio)
-
-                    # Estimate substrate utilization
-                    substrate_area = self.substrate_width * self.substrate_height
-                    utilization = (target_length * 0.002) / substrate_area * 100
-                    substrate_utilizations.append(min(100, utilization))
-
-            # Calculate central frequency for sorting
-            center_freq = sum(frequencies_mhz) / len(frequencies_mhz)
+            # Lengths depend only on frequencies, substrate and meander settings, so bands
+            # charted more than once (detailed + comparison charts) reuse the result
+            lengths = BandAnalysisChart._band_lengths_cached(
+                tuple(frequencies_mhz), self.substrate_width, self.substrate_height,
+                tuple(sorted(MEANDER_CONSTRAINTS.items())), fast)
 
             return {
                 'band_name': frequency_band.name,
                 'band_type': frequency_band.band_type.value,
-                'frequencies_mhz': frequencies_mhz,
-                'center_frequency_mhz': center_freq,
-                'electrical_lengths_quarter': electrical_lengths_quarter,  # λ/4 (inches)
-                'electrical_lengths_half': electrical_lengths_half,       # λ/2 (inches)
-                'electrical_lengths_full': electrical_lengths_full,       # λ (inches)
-                'trace_lengths_inches': trace_lengths,                    # Actual meandered lengths
-                'meandering_ratios': meandering_ratios,                   # trace_length / electrical_length
-                'substrate_utilizations': substrate_utilizations,         # % of substrate used
-                'band_count': len(frequencies_mhz)
+                **copy.deepcopy(lengths)
             }
 
         except Exception as e:
             logger.error(f"Error calculating lengths for {frequency_band.name}: {str(e)}")
             return None
 
-    def _calculate_geometry_trace_length(self, geometry: str) -> float:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _band_lengths_cached(frequencies_mhz: tuple, substrate_width: float, substrate_height: float,
+                             constraints_items: tuple, fast: bool = False) -> Dict[str, Any]:
+        """Compute the frequency-dependent part of calculate_band_lengths. Do not mutate the result."""
+        advanced_meander = AdvancedMeanderTrace(substrate_width, substrate_height)
+        frequencies_mhz = list(frequencies_mhz)
+        substrate_area = substrate_width * substrate_height
+
+        # Calculate theoretical electrical lengths in inches for all frequencies at once as
+        # one (3, N) array of λ/4, λ/2, λ rows (halving and quartering are exact scalings)
+        lambda_full = SPEED_OF_LIGHT / (np.asarray(frequencies_mhz, dtype=np.float64) * 1e6) / INCHES_TO_M
+        electrical_lengths = lambda_full * ELECTRICAL_LENGTH_FRACTIONS[:, np.newaxis]
+        # Python float lists for the per-frequency ratios and the legacy per-row result keys
+        electrical_lengths_quarter, electrical_lengths_half, electrical_lengths_full = electrical_lengths.tolist()
+
+        # Calculate actual meandered trace lengths using AdvancedMeanderTrace
+        # This uses the same algorithms as the design generator
+        trace_lengths = []
+        meandering_ratios = []
+        substrate_utilizations = []
+
+        # Use multi-band meander generation for accurate length calculation
+        if fast:
+            multi_result = {}
+        else:
+            multi_result = advanced_meander.generate_multi_band_meanders(frequencies_mhz, dict(constraints_items))
+
+        if multi_result.get('combined_geometry'):
+            # Extract actual trace length from generated geometry
+            geometry = multi_result['combined_geometry']
+            total_trace_length = BandAnalysisChart._calculate_geometry_trace_length(geometry)
+
+            # For multi-band designs, distribute the total length across frequencies
+            avg_trace_length = total_trace_length / len(frequencies_mhz)
+            trace_lengths = [avg_trace_length] * len(frequencies_mhz)
+
+            # Calculate meandering ratio for each frequency
+            for i, freq_mhz in enumerate(frequencies_mhz):
+                # Target electrical length (half-wave dipole equivalent)
+                target_electrical = electrical_lengths_half[i]
+                actual_trace = trace_lengths[i]
+                ratio = actual_trace / target_electrical if target_electrical > 0 else 1.0
+                meandering_ratios.append(ratio)
+
+                # Substrate utilization estimate
+                utilization = (actual_trace * 0.002) / substrate_area * 100  # Rough estimate
+                substrate_utilizations.append(min(100, utilization))
+
+        else:
+            # Fallback (or fast mode): Estimate trace lengths individually
+            if not fast:
+                logger.warning("Multi-band geometry generation failed, using individual estimates")
+            # Estimate trace lengths using the same algorithm as advanced meander, all at once
+            target_lengths = advanced_meander.extract_target_length_batch(np.asarray(frequencies_mhz))
+            trace_lengths = target_lengths.tolist()
+
+            # Meandering ratio (actual should be higher than electrical)
+            half_wave = electrical_lengths[1]
+            meandering_ratios = np.where(half_wave > 0, target_lengths / half_wave, 1.0).tolist()
+
+            # Estimate substrate utilization
+            utilizations = (target_lengths * 0.002) / substrate_area * 100
+            substrate_utilizations = np.minimum(100.0, utilizations).tolist()
+
+        # Calculate central frequency for sorting
+        center_freq = sum(frequencies_mhz) / len(frequencies_mhz)
+
+        return {
+            'frequencies_mhz': frequencies_mhz,
+            'center_frequency_mhz': center_freq,
+            'electrical_lengths': electrical_lengths,                 # (3, N): λ/4, λ/2, λ rows (inches)
+            'electrical_lengths_quarter': electrical_lengths_quarter,  # λ/4 (inches)
+            'electrical_lengths_half': electrical_lengths_half,       # λ/2 (inches)
+            'electrical_lengths_full': electrical_lengths_full,       # λ (inches)
+            'trace_lengths_inches': trace_lengths,                    # Actual meandered lengths
+            'meandering_ratios': meandering_ratios,                   # trace_length / electrical_length
+            'substrate_utilizations': substrate_utilizations,         # % of substrate used
+            'band_count': len(frequencies_mhz)
+        }
+
+    @staticmethod
+    def _calculate_geometry_trace_length(geometry: str) -> float:
         """Calculate total trace length from NEC2 geometry string.
 
         Args:
             geometry: NEC2 geometry string
 
         Returns:
-            float: Total trace length in inches
+            float: Total trace length in inches (malformed GW cards are skipped)
         """
+        # Only GW cards are matched, so the geometry is never split into a list of lines
+        rows = _GW_CARD.findall(geometry)
+
         try:
-            total_length = 0.0
-            lines = geometry.split('\n')
-
-            for line in lines:
-                line = line.strip()
-                if line.startswith('GW') and len(line.split()) >= 8:
-                    parts = line.split()
-                    try:
-                        x1, y1 = float(parts[3]), float(parts[4])
-                        x2, y2 = float(parts[6]), float(parts[7])
-                        segment_length = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-                        total_length += segment_length
-                    except (ValueError, IndexError):
-                        continue
-
-            return total_length
-        except Exception as e:
-            logger.error(f"Error calculating geometry length: {str(e)}")
-            return 0.0
+            coords = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        except ValueError:
+            # Malformed number somewhere - skip just the bad rows
+            coords = np.array([row for row in map(BandAnalysisChart._parse_gw_row, rows) if row is not None],
+                              dtype=np.float64).reshape(-1, 4)
+
+        return total_length(coords)
+
+    @staticmethod
+    def _parse_gw_row(row: tuple) -> Optional[List[float]]:
+        """Convert one (x1, y1, x2, y2) string row to floats, or None if it is malformed."""
+        try:
+            return [float(v) for v in row]
+        except ValueError:
+            return None
+
+    def precompute(self, bands: Dict[str, FrequencyBand], fast: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Calculate lengths for several bands at once.
+
+        Every chart method goes through here, and results come from the shared
+        length cache, so a band drawn by more than one chart is only computed
+        once. Runs serially: meander generation is pure Python and takes a few
+        tens of milliseconds per band, so worker pools cost more than they save.
+
+        Args:
+            bands: Dict of band key -> FrequencyBand
+            fast: Estimate trace lengths without generating meander geometry
+
+        Returns:
+            dict: band key -> calculate_band_lengths result (failed bands omitted)
+        """
+        results = {}
+        for band_key, frequency_band in bands.items():
+            band_result = self.calculate_band_lengths(frequency_band, fast)
+            if band_result:
+                results[band_key] = band_result
+        return results
+
+    def _sorted_band_data(self, bands: Dict[str, FrequencyBand], fast: bool = False) -> List[Dict[str, Any]]:
+        """Band length results sorted by center frequency for better visualization."""
+        return sorted(self.precompute(bands, fast).values(), key=lambda x: x['center_frequency_mhz'])
 
     def create_custom_comparison_chart(self, custom_bands: Dict[str, FrequencyBand], save_path: str = "band_analysis_custom.png",
-                                     figsize: tuple = (16, 10)) -> str:
+                                     figsize: tuple = (16, 10), fast: bool = False,
+                                     dpi: int = DEFAULT_CHART_DPI) -> str:
         """Create chart comparing only custom frequency bands (not all presets).
 
         Args:
             custom_bands: Dict of band_name -> FrequencyBand for custom bands
             save_path: Path to save the chart image
             figsize: Figure size (width, height) in inches
+            fast: Estimate trace lengths without generating meander geometry
+            dpi: Output resolution (use 300 for print quality)
 
         Returns:
             str: Path to saved chart file
         """
         try:
-            band_data = []
-
-            # Calculate lengths for each custom band
-            for band_name, frequency_band in custom_bands.items():
-                band_result = self.calculate_band_lengths(frequency_band)
-                if band_result:
-                    band_data.append(band_result)
+            band_data = self._sorted_band_data(custom_bands, fast)
 
             if not band_data:
                 logger.error("No custom band data calculated")
                 return ""
 
-            # Sort by center frequency for better visualization
-            band_data.sort(key=lambda x: x['center_frequency_mhz'])
-
-            return self._generate_comparison_chart_content(band_data, save_path, figsize, "Custom Band Analysis")
+            return self._generate_comparison_chart_content(band_data, save_path, figsize, "Custom Band Analysis", dpi)
 
         except Exception as e:
             logger.error(f"Error creating custom comparison chart: {str(e)}")
             return ""
 
+    @staticmethod
+    def _band_chart_arrays(band_data: List[Dict]) -> BandChartArrays:
+        """Collect the per-band values plotted by the comparison chart in one pass."""
+        labels, short_labels, band_types = [], [], []
+        center_mhz, max_trace, max_half, has_lengths, mean_ratio, all_ratios = [], [], [], [], [], []
+
+        for bd in band_data:
+            freqs = bd['frequencies_mhz']
+            trace_inches = bd['trace_lengths_inches']
+            half_wave = bd['electrical_lengths'][1]
+            ratios = bd['meandering_ratios']
+
+            # Use frequency labels instead of band names
+            if len(freqs) == 3:
+                labels.append(f"{freqs[0]}/{freqs[1]}/{freqs[2]} MHz")
+            else:
+                labels.append(f"{freqs[0]} MHz" if freqs else "Unknown")
+            short_labels.append(f"{freqs[0]}" if len(freqs) == 1 else f"{freqs[0]}/{freqs[1]}/{freqs[2]}")
+
+            band_types.append(bd['band_type'])
+            center_mhz.append(bd['center_frequency_mhz'])
+            max_trace.append(max(trace_inches) if trace_inches else 0.0)
+            max_half.append(half_wave.max() if half_wave.size else 0.0)
+            has_lengths.append(bool(half_wave.size and trace_inches))
+            mean_ratio.append(np.mean(ratios) if ratios else 1.0)
+            all_ratios.extend(ratios)
+
+        # Lengths are converted from inches to mm (x 25.4) for display
+        return BandChartArrays(
+            labels=labels,
+            short_labels=short_labels,
+            band_types=band_types,
+            center_mhz=np.array(center_mhz, dtype=np.float64),
+            max_trace_mm=np.array(max_trace, dtype=np.float64) * 25.4,
+            max_half_mm=np.array(max_half, dtype=np.float64) * 25.4,
+            has_lengths=np.array(has_lengths, dtype=bool),
+            mean_ratio=np.array(mean_ratio, dtype=np.float64),
+            all_ratios=np.array(all_ratios, dtype=np.float64)
+        )
+
     def _generate_comparison_chart_content(self, band_data: List[Dict], save_path: str,
-                                         figsize: tuple, title: str) -> str:
+                                         figsize: tuple, title: str, dpi: int = DEFAULT_CHART_DPI) -> str:
         """Generate the actual comparison chart content (shared by regular and custom charts).
 
         Args:
@@ -217,39 +359,31 @@ class BandAnalysisChart:
             save_path: Path to save the chart image
             figsize: Figure size (width, height) in inches
             title: Chart title
+            dpi: Output resolution
 
         Returns:
             str: Path to saved chart file
         """
         try:
             # Create figure with subplots
-            fig, axes = plt.subplots(2, 2, figsize=figsize)
+            fig, axes = _pooled_subplots(2, 2, figsize)
             fig.suptitle(f'{title} - {self.substrate_width}"×{self.substrate_height}" Substrate',
                         fontsize=16, fontweight='bold')
 
-            # Color mapping for different band types
-            band_types = list(set(bd['band_type'] for bd in band_data))
-            type_colors = {bt: self.colors[i % len(self.colors)] for i, bt in enumerate(band_types)}
-
-            # Extract data for plotting
-            # Use frequency labels instead of band names
-            band_labels = []
-            for bd in band_data:
-                freqs = bd['frequencies_mhz']
-                if len(freqs) == 3:
-                    band_labels.append(f"{freqs[0]}/{freqs[1]}/{freqs[2]} MHz")
-                else:
-                    band_labels.append(f"{freqs[0]} MHz" if freqs else "Unknown")
-
-            center_freqs = [bd['center_frequency_mhz'] for bd in band_data]
-
-            # Convert trace lengths from inches to mm for display (multiply by 25.4)
-            max_trace_lengths_mm = [max(bd['trace_lengths_inches']) * 25.4 if bd['trace_lengths_inches'] else 0
-                                  for bd in band_data]
+            # Extract data for plotting once; every subplot reads these arrays
+            arrays = self._band_chart_arrays(band_data)
 
-            avg_meandering_ratios = [np.mean(bd['meandering_ratios']) if bd['meandering_ratios'] else 1.0
-                                   for bd in band_data]
-            band_colors = [type_colors[bd['band_type']] for bd in band_data]
+            # Color mapping for different band types, in order of first appearance
+            # so colors are the same from run to run
+            band_types = list(dict.fromkeys(arrays.band_types))
+            type_colors = {bt: self.colors[i % len(self.colors)] for i, bt in enumerate(band_types)}
+            band_labels = arrays.labels
+            center_freqs = arrays.center_mhz
+            max_trace_lengths_mm = arrays.max_trace_mm
+            max_half_wave_mm = arrays.max_half_mm
+            has_lengths = arrays.has_lengths
+            avg_meandering_ratios = arrays.mean_ratio
+            band_colors = [type_colors[band_type] for band_type in arrays.band_types]
 
             # Subplot 1: Frequency vs Trace Length (in mm)
             ax1 = axes[0, 0]
@@ -261,10 +395,7 @@ class BandAnalysisChart:
             ax1.set_xticklabels(band_labels, rotation=45, ha='right')
 
             # Add value labels on bars (in mm)
-            for bar, length_mm in zip(bars1, max_trace_lengths_mm):
-                height = bar.get_height()
-                ax1.text(bar.get_x() + bar.get_width()/2., height + 2,
-                        f'{length_mm:.0f}mm', ha='center', va='bottom', fontsize=8)
+            ax1.bar_label(bars1, fmt='%.0fmm', padding=2, fontsize=8)
 
             # Subplot 2: Meandering Ratio Comparison
             ax2 = axes[0, 1]
@@ -280,31 +411,15 @@ class BandAnalysisChart:
             ax2.legend()
 
             # Add value labels
-            for bar, ratio in zip(bars2, avg_meandering_ratios):
-                height = bar.get_height()
-                ax2.text(bar.get_x() + bar.get_width()/2., height + 0.02,
-                        f'{ratio:.1f}x', ha='center', va='bottom', fontsize=8)
+            ax2.bar_label(bars2, fmt='%.1fx', padding=2, fontsize=8)
 
             # Subplot 3: Theoretical vs Actual Lengths for key bands (in mm)
             ax3 = axes[1, 0]
 
-            # Select all bands for detailed comparison (typically 3 frequencies)
-            key_bands = band_data
-
-            freq_labels = []
-            theoretical_half_wave_mm = []  # Convert to mm
-            actual_trace_lengths_mm = []   # Convert to mm
-
-            for i, bd in enumerate(key_bands):
-                if bd['electrical_lengths_half'] and bd['trace_lengths_inches']:
-                    # Use maximum electrical half-wave length (convert to mm)
-                    max_theoretical_mm = max(bd['electrical_lengths_half']) * 25.4
-                    # Use maximum actual trace length (convert to mm)
-                    max_actual_mm = max(bd['trace_lengths_inches']) * 25.4
-
-                    freq_labels.append(band_labels[i])
-                    theoretical_half_wave_mm.append(max_theoretical_mm)
-                    actual_trace_lengths_mm.append(max_actual_mm)
+            # Compare maximum half-wave and actual lengths for every band that has both
+            freq_labels = [label for label, keep in zip(band_labels, has_lengths) if keep]
+            theoretical_half_wave_mm = max_half_wave_mm[has_lengths]
+            actual_trace_lengths_mm = max_trace_lengths_mm[has_lengths]
 
             if freq_labels:
                 x = np.arange(len(freq_labels))
@@ -323,23 +438,15 @@ class BandAnalysisChart:
                 ax3.legend()
 
                 # Add value annotations (in mm)
-                for bar, value in zip(bars3a, theoretical_half_wave_mm):
-                    height = bar.get_height()
-                    ax3.text(bar.get_x() + bar.get_width()/2., height + 10,
-                            f'{value:.0f}mm', ha='center', va='bottom', fontsize=7, rotation=90)
-
-                for bar, value in zip(bars3b, actual_trace_lengths_mm):
-                    height = bar.get_height()
-                    ax3.text(bar.get_x() + bar.get_width()/2., height + 10,
-                            f'{value:.0f}mm', ha='center', va='bottom', fontsize=7, rotation=90)
+                for bars in (bars3a, bars3b):
+                    ax3.bar_label(bars, fmt='%.0fmm', padding=10, fontsize=7, rotation=90)
 
             # Subplot 4: Frequency vs Length Trend (in mm)
             ax4 = axes[1, 1]
 
             # Plot trend of frequency vs maximum trace length
-            freq_mhz = [bd['center_frequency_mhz'] for bd in band_data]
-            trace_lengths_mm = [max(bd['trace_lengths_inches']) * 25.4 if bd['trace_lengths_inches'] else 0
-                              for bd in band_data]
+            freq_mhz = center_freqs
+            trace_lengths_mm = max_trace_lengths_mm
 
             # Sort by frequency
             freq_sorted = sorted(zip(freq_mhz, trace_lengths_mm))
@@ -347,17 +454,17 @@ class BandAnalysisChart:
             ax4.scatter([x[0] for x in freq_sorted], [x[1] for x in freq_sorted],
                        s=50, c=band_colors[:len(freq_sorted)], alpha=0.7)
 
-            # Add trend line
+            # Add trend line (closed-form least-squares fit; no SVD needed for two parameters)
             if len(freq_sorted) > 2:
-                x_trend = [x[0] for x in freq_sorted]
-                y_trend = [x[1] for x in freq_sorted]
-                try:
-                    coeffs = np.polyfit(x_trend, y_trend, 1)
-                    poly = np.poly1d(coeffs)
-                    x_line = np.linspace(min(x_trend), max(x_trend), 100)
-                    ax4.plot(x_line, poly(x_line), 'r--', alpha=0.5, label='Trend')
-                except np.RankWarning:
-                    pass  # Skip trend line if data is too sparse
+                x_trend = np.array([x[0] for x in freq_sorted], dtype=np.float64)
+                y_trend = np.array([x[1] for x in freq_sorted], dtype=np.float64)
+                x_dev = x_trend - x_trend.mean()
+                denom = (x_dev * x_dev).sum()
+                if denom > 0:  # Skip trend line if all bands share one frequency
+                    slope = (x_dev * (y_trend - y_trend.mean())).sum() / denom
+                    intercept = y_trend.mean() - slope * x_trend.mean()
+                    x_line = np.linspace(x_trend[0], x_trend[-1], 100)
+                    ax4.plot(x_line, slope * x_line + intercept, 'r--', alpha=0.5, label='Trend')
 
             ax4.set_xlabel('Center Frequency (MHz)')
             ax4.set_ylabel('Maximum Trace Length (mm)')
@@ -365,12 +472,9 @@ class BandAnalysisChart:
             ax4.set_xscale('log')
             ax4.grid(True, alpha=0.3)
 
-            # Add frequency annotations
-            for i, (freq, length_mm) in enumerate(zip(freq_mhz, trace_lengths_mm)):
-                if i < len(band_data):
-                    bd = band_data[i]
-                    freqs = bd['frequencies_mhz']
-                    label = f"{freqs[0]}" if len(freqs) == 1 else f"{freqs[0]}/{freqs[1]}/{freqs[2]}"
+            # Add frequency annotations (skipped for many bands: unreadable and slow to lay out)
+            if len(band_data) <= MAX_SCATTER_ANNOTATIONS:
+                for label, freq, length_mm in zip(arrays.short_labels, freq_mhz, trace_lengths_mm):
                     ax4.annotate(label, (freq, length_mm),
                                xytext=(5, 5), textcoords='offset points', fontsize=8)
 
@@ -385,7 +489,8 @@ class BandAnalysisChart:
 
             # Add summary text with mm units
             total_bands = len(band_data)
-            avg_ratio = np.mean([r for bd in band_data for r in bd['meandering_ratios'] if r > 0])
+            all_ratios = arrays.all_ratios
+            avg_ratio = np.mean(all_ratios[all_ratios > 0])
             substrate_area = self.substrate_width * self.substrate_height
 
             summary_text = f"""
@@ -400,9 +505,7 @@ Custom Band Analysis Summary:
             fig.text(0.02, 0.02, summary_text, fontsize=8, verticalalignment='bottom',
                     bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
-            plt.tight_layout()
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            _save_pooled_figure(fig, save_path, dpi)
 
             logger.info(f"Chart saved to {save_path}")
             return save_path
@@ -412,12 +515,15 @@ Custom Band Analysis Summary:
             return ""
 
     def create_comparison_chart(self, save_path: str = "band_analysis_chart.png",
-                               figsize: tuple = (16, 10)) -> str:
+                               figsize: tuple = (16, 10), fast: bool = False,
+                               dpi: int = DEFAULT_CHART_DPI) -> str:
         """Create comprehensive chart comparing all frequency bands.
 
         Args:
             save_path: Path to save the chart image
             figsize: Figure size (width, height) in inches
+            fast: Estimate trace lengths without generating meander geometry
+            dpi: Output resolution (use 300 for print quality)
 
         Returns:
             str: Path to saved chart file
@@ -425,35 +531,70 @@ Custom Band Analysis Summary:
         try:
             # Get all frequency bands
             all_bands = BandPresets.get_all_bands()
-            band_data = []
-
-            # Calculate lengths for each band
-            for band_key, frequency_band in all_bands.items():
-                band_result = self.calculate_band_lengths(frequency_band)
-                if band_result:
-                    band_data.append(band_result)
+            band_data = self._sorted_band_data(all_bands, fast)
 
             if not band_data:
                 logger.error("No band data calculated")
                 return ""
 
-            # Sort by center frequency for better visualization
-            band_data.sort(key=lambda x: x['center_frequency_mhz'])
-
-            return self._generate_comparison_chart_content(band_data, save_path, figsize, "Band Analysis")
+            return self._generate_comparison_chart_content(band_data, save_path, figsize, "Band Analysis", dpi)
 
         except Exception as e:
             logger.error(f"Error creating comparison chart: {str(e)}")
             return ""
 
+    def create_combined_chart(self, custom_bands: Dict[str, FrequencyBand],
+                              save_path: str = "band_analysis_chart.png",
+                              custom_save_path: str = "band_analysis_custom.png",
+                              figsize: tuple = (16, 10), fast: bool = False,
+                              dpi: int = DEFAULT_CHART_DPI) -> Tuple[str, str]:
+        """Create the all-presets and custom-band comparison charts together.
+
+        Lengths for both band sets are gathered up front, so a custom band that
+        matches a preset is calculated once, and both charts are drawn
+        back-to-back on the same pooled figure.
+
+        Args:
+            custom_bands: Dict of band_name -> FrequencyBand for custom bands
+            save_path: Path to save the all-presets chart image
+            custom_save_path: Path to save the custom-band chart image
+            figsize: Figure size (width, height) in inches
+            fast: Estimate trace lengths without generating meander geometry
+            dpi: Output resolution (use 300 for print quality)
+
+        Returns:
+            tuple: (preset chart path, custom chart path); "" for a chart that failed
+        """
+        try:
+            preset_data = self._sorted_band_data(BandPresets.get_all_bands(), fast)
+            custom_data = self._sorted_band_data(custom_bands, fast)
+        except Exception as e:
+            logger.error(f"Error calculating combined chart data: {str(e)}")
+            return "", ""
+
+        preset_path = custom_path = ""
+        if preset_data:
+            preset_path = self._generate_comparison_chart_content(preset_data, save_path, figsize, "Band Analysis", dpi)
+        else:
+            logger.error("No band data calculated")
+
+        if custom_data:
+            custom_path = self._generate_comparison_chart_content(custom_data, custom_save_path, figsize,
+                                                                  "Custom Band Analysis", dpi)
+        else:
+            logger.error("No custom band data calculated")
+
+        return preset_path, custom_path
+
     def create_detailed_band_chart(self, band_name: str = None, save_path: str = "detailed_band_chart.png",
-                                  figsize: tuple = (14, 8)) -> str:
+                                  figsize: tuple = (14, 8), dpi: int = DEFAULT_CHART_DPI) -> str:
         """Create detailed chart for a specific band showing all length relationships.
 
         Args:
             band_name: Name of specific band to chart (if None, shows all)
             save_path: Path to save the chart
             figsize: Figure size
+            dpi: Output resolution (use 300 for print quality)
 
         Returns:
             str: Path to saved chart file
@@ -465,19 +606,22 @@ Custom Band Analysis Summary:
                 if band_name not in all_bands:
                     logger.error(f"Band '{band_name}' not found")
                     return ""
-                bands_to_chart = [all_bands[band_name]]
+                band_keys = [band_name]
             else:
-                bands_to_chart = list(all_bands.values())[:3]  # First 3 bands
+                band_keys = list(all_bands)[:3]  # First 3 bands
+
+            bands_to_chart = [all_bands[band_key] for band_key in band_keys]
+            band_results = self.precompute(dict(zip(band_keys, bands_to_chart)))
 
-            fig, axes = plt.subplots(len(bands_to_chart), 1, figsize=figsize)
+            fig, axes = _pooled_subplots(len(bands_to_chart), 1, figsize)
             if len(bands_to_chart) == 1:
                 axes = [axes]
 
-            for i, frequency_band in enumerate(bands_to_chart):
+            for i, (band_key, frequency_band) in enumerate(zip(band_keys, bands_to_chart)):
                 ax = axes[i]
 
                 # Get band data
-                band_result = self.calculate_band_lengths(frequency_band)
+                band_result = band_results.get(band_key)
                 if not band_result:
                     continue
 
@@ -508,13 +652,11 @@ Custom Band Analysis Summary:
                     ax.legend()
 
                 # Add substrate boundary line
-                substrate_diagonal = math.sqrt(self.substrate_width**2 + self.substrate_height**2)
+                substrate_diagonal = math.hypot(self.substrate_width, self.substrate_height)
                 ax.axhline(y=substrate_diagonal, color='red', linestyle=':', alpha=0.5,
                           label=f'Substrate diagonal ({substrate_diagonal:.1f}")')
 
-            plt.tight_layout()
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            _save_pooled_figure(fig, save_path, dpi)
 
             logger.info(f"Detailed band chart saved to {save_path}")
             return save_path
@@ -526,20 +668,22 @@ Custom Band Analysis Summary:
 
 def create_band_analysis_chart(save_path: str = "band_analysis.png",
                               substrate_width: float = 4.0,
-                              substrate_height: float = 2.0) -> str:
+                              substrate_height: float = 2.0,
+                              dpi: int = DEFAULT_CHART_DPI) -> str:
     """Convenience function to create the main band analysis chart.
 
     Args:
         save_path: Path to save the chart
         substrate_width: Substrate width in inches
         substrate_height: Substrate height in inches
+        dpi: Output resolution (use 300 for print quality)
 
     Returns:
         str: Path to saved chart file
     """
     try:
         chart = BandAnalysisChart(substrate_width, substrate_height)
-        return chart.create_comparison_chart(save_path)
+        return chart.create_comparison_chart(save_path, dpi=dpi)
     except Exception as e:
         logger.error(f"Error in convenience function: {str(e)}")
         return ""
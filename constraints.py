@@ -1,13 +1,52 @@
 """Substrate and manufacturing constraints for antenna design."""
-from typing import Dict, List, Tuple, Optional, Any
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Tuple, Optional, Any
+import functools
+import re
 import numpy as np
 from loguru import logger
 
+
+# A whole GW or SP card line (leading whitespace allowed). Whitespace excludes
+# newlines so a match never runs into the next line.
+_CARD_LINE = re.compile(r'^[^\S\n]*(?:GW|SP)[^\n]*', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=16)
+def _tokenize_geometry(geometry: str) -> Tuple[Tuple[Tuple[str, ...], ...], Tuple[Tuple[str, ...], ...]]:
+    """Split the GW and SP cards of a NEC2 geometry string into token tuples.
+
+    Card lines are picked out with one regex scan, so the geometry is never
+    split into a list of every line and only card lines are tokenized. GW
+    cards with fewer than 8 tokens and SP cards with fewer than 4 are
+    dropped, as every validator ignores them. Memoized so validators run on
+    the same geometry share one tokenization. Do not mutate the result.
+
+    Returns:
+        tuple: (GW card tokens, SP card tokens)
+    """
+    gw_cards = []
+    sp_cards = []
+
+    for line in _CARD_LINE.findall(geometry):
+        parts = tuple(line.split())
+        if len(parts) >= 8 and parts[0] == 'GW':
+            gw_cards.append(parts)
+        elif len(parts) >= 4 and parts[0] == 'SP':
+            sp_cards.append(parts)
+
+    return tuple(gw_cards), tuple(sp_cards)
+
+
 class SubstrateConstraints:
     """Define physical constraints for 2x4 inch copper substrate."""
 
-    def __init__(self, width: float = 4.0, height: float = 2.0):
-        """Initialize with substrate dimensions in inches."""
+    def __init__(self, width: float = 4.0, height: float = 2.0, verbose: bool = False):
+        """Initialize with substrate dimensions in inches.
+
+        ``verbose`` logs the construction; it is off so batch checks that
+        create many instances do not emit a log line each.
+        """
         self.width = width
         self.height = height
         self.area = width * height
@@ -26,19 +65,27 @@ class SubstrateConstraints:
         self.spot_size_min = 0.003  # Minimum laser spot size
         self.etch_resolution = 0.005  # Best achievable resolution
 
-        logger.info(f"Substrate constraints initialized: {width}x{height} inches")
+        # Usable area and point-validity box, fixed once the dimensions are set
+        self._usable_area = (width - 2 * self.edge_clearance, height - 2 * self.edge_clearance)
+        self._xlo, self._xhi = self.edge_clearance, width - self.edge_clearance
+        self._ylo, self._yhi = self.edge_clearance, height - self.edge_clearance
+
+        if verbose:
+            logger.info(f"Substrate constraints initialized: {width}x{height} inches")
 
     def get_usable_area(self) -> Tuple[float, float]:
         """Get usable area after edge clearance."""
-        usable_width = self.width - 2 * self.edge_clearance
-        usable_height = self.height - 2 * self.edge_clearance
-        return usable_width, usable_height
+        return self._usable_area
 
     def is_point_valid(self, x: float, y: float) -> bool:
         """Check if a point (x,y) is within usable substrate area."""
-        usable_width, usable_height = self.get_usable_area()
-        return (self.edge_clearance <= x <= self.width - self.edge_clearance and
-                self.edge_clearance <= y <= self.height - self.edge_clearance)
+        return self._xlo <= x <= self._xhi and self._ylo <= y <= self._yhi
+
+    def is_point_valid_batch(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Check many points at once; returns a bool array, True where is_point_valid would be."""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        return (xs >= self._xlo) & (xs <= self._xhi) & (ys >= self._ylo) & (ys <= self._yhi)
 
     def check_geometry_bounds(self, geometry: str) -> Dict[str, Any]:
         """Validate geometry against substrate constraints."""
@@ -51,30 +98,25 @@ class SubstrateConstraints:
         }
 
         try:
-            # Parse geometry to extract coordinates
-            lines = geometry.split('\n')
-            coords = []
-
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 8 and parts[0] == 'GW':
-                    x1, y1 = float(parts[3]), float(parts[4])
-                    x2, y2 = float(parts[6]), float(parts[7])
-                    coords.extend([(x1, y1), (x2, y2)])
-                elif len(parts) >= 4 and parts[0] == 'SP':
-                    # Handle surface patches
-                    i = 3
-                    while i < len(parts) - 2:
-                        x, y = float(parts[i]), float(parts[i+1])
-                        coords.append((x, y))
-                        i += 3
-
-            if coords:
-                x_coords = [c[0] for c in coords]
-                y_coords = [c[1] for c in coords]
-
-                max_x = max(abs(min(x_coords)), abs(max(x_coords)))
-                max_y = max(abs(min(y_coords)), abs(max(y_coords)))
+            # Convert the coordinate tokens of the shared tokenization in one NumPy pass
+            gw_cards, sp_cards = _tokenize_geometry(geometry)
+            gw_rows = [(parts[3], parts[4], parts[6], parts[7]) for parts in gw_cards]
+            sp_points = []
+
+            for parts in sp_cards:
+                # Handle surface patches
+                i = 3
+                while i < len(parts) - 2:
+                    sp_points.append((parts[i], parts[i+1]))
+                    i += 3
+
+            # (x, y) rows: both endpoints of every wire, then patch points
+            coords = np.array(gw_rows, dtype=np.float64).reshape(-1, 2)
+            if sp_points:
+                coords = np.vstack((coords, np.array(sp_points, dtype=np.float64)))
+
+            if len(coords):
+                max_x, max_y = np.abs(coords).max(axis=0).tolist()
 
                 validation['max_extent'] = {'x': max_x, 'y': max_y}
 
@@ -171,16 +213,9 @@ class ManufacturingRules:
 
         try:
             # Count different element types
-            lines = geometry.split('\n')
-            wire_count = 0
-            segment_count = 0
-
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 8 and parts[0] == 'GW':
-                    wire_count += 1
-                    segments = int(float(parts[2]))
-                    segment_count += segments
+            gw_cards, _ = _tokenize_geometry(geometry)
+            wire_count = len(gw_cards)
+            segment_count = sum(int(float(parts[2])) for parts in gw_cards)
 
             # Assess complexity
             total_elements = wire_count
@@ -219,6 +254,21 @@ class ManufacturingRules:
 
         return result
 
+# VSWR efficiency tiers: VSWR below VSWR_TIER_LIMITS[i] falls in tier i, anything
+# higher in the last tier. A VSWR under 3:1 passes.
+VSWR_TIER_LIMITS = np.array([1.5, 2.0, 3.0, 5.0])
+VSWR_TIER_EFFICIENCY = np.array([95.0, 90.0, 80.0, 65.0, 40.0])
+VSWR_TIER_PASSES = np.array([True, True, True, False, False])
+
+# Impedance match quality: |Γ| below MATCH_GAMMA_LIMITS[i] rates MATCH_ASSESSMENTS[i]
+# (-20 dB, -13 dB and -9.5 dB return loss); the first two tiers count as matched
+MATCH_GAMMA_LIMITS = np.array([0.1, 0.22, 0.33])
+MATCH_ASSESSMENTS = np.array(['excellent', 'good', 'acceptable', 'poor'])
+MATCHED_TIERS = 2
+# Assessment for an impedance of -target, where Γ is undefined (same text the scalar check reports)
+MATCH_UNDEFINED = 'error: complex division by zero'
+
+
 class ElectricalConstraints:
     """Electrical design constraints and validation."""
 
@@ -264,6 +314,43 @@ class ElectricalConstraints:
 
         return result
 
+    @staticmethod
+    def check_impedance_matching_batch(impedances_ohms: np.ndarray, target: float = 50.0) -> Dict[str, np.ndarray]:
+        """Validate impedance matching for a whole sweep of impedances at once.
+
+        Array counterpart of check_impedance_matching: same formulas and
+        thresholds, one entry per impedance. A total mismatch (|Γ| = 1) gives
+        an infinite VSWR instead of an error. An impedance of -target has no
+        reflection coefficient: its numeric entries are NaN, it is not
+        matched, and its assessment is MATCH_UNDEFINED.
+
+        Args:
+            impedances_ohms: Complex impedances, e.g. one per sweep frequency
+            target: Reference impedance in ohms
+
+        Returns:
+            dict: Arrays 'reflection_coefficient', 'vswr', 'return_loss_db',
+            'is_matched' (bool) and 'assessment' (str)
+        """
+        z = np.asarray(impedances_ohms, dtype=np.complex128)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gamma_mag = np.abs((z - target) / (z + target))
+            undefined = ~np.isfinite(gamma_mag)
+            gamma_mag[undefined] = np.nan
+            vswr = (1 + gamma_mag) / (1 - gamma_mag)
+            return_loss_db = np.where(gamma_mag > 0, -20 * np.log10(gamma_mag), np.inf)
+        return_loss_db[undefined] = np.nan
+
+        tiers = np.digitize(gamma_mag, MATCH_GAMMA_LIMITS)
+        return {
+            'is_matched': (tiers < MATCHED_TIERS) & ~undefined,
+            'return_loss_db': return_loss_db,
+            'vswr': vswr,
+            'reflection_coefficient': gamma_mag,
+            'assessment': np.where(undefined, MATCH_UNDEFINED, MATCH_ASSESSMENTS[tiers])
+        }
+
     @staticmethod
     def check_efficiency_requirements(vswr_values: List[float]) -> Dict[str, Any]:
         """Evaluate tri-band efficiency based on VSWR values."""
@@ -274,36 +361,18 @@ class ElectricalConstraints:
             'band_ratings': []
         }
 
-        target_vswr = 3.0  # VSWR < 3:1 acceptable
-        efficiency_factors = []  # Rough efficiency estimates
+        # Look up every band's efficiency estimate and pass flag at once
+        tiers = np.searchsorted(VSWR_TIER_LIMITS, np.asarray(vswr_values, dtype=np.float64), side='right')
+        efficiency_factors = VSWR_TIER_EFFICIENCY[tiers].tolist()  # Rough efficiency estimates
+        passes = VSWR_TIER_PASSES[tiers].tolist()
 
         for i, vswr in enumerate(vswr_values):
-            band_rating = {
+            result['band_ratings'].append({
                 'band': f'B{i+1}',
                 'vswr': vswr,
-                'passes': vswr < target_vswr,
-                'efficiency_percent': 0.0
-            }
-
-            # Estimate efficiency from VSWR
-            if vswr < 1.5:
-                band_rating['passes'] = True
-                band_rating['efficiency_percent'] = 95.0
-            elif vswr < 2.0:
-                band_rating['passes'] = True
-                band_rating['efficiency_percent'] = 90.0
-            elif vswr < 3.0:
-                band_rating['passes'] = True
-                band_rating['efficiency_percent'] = 80.0
-            elif vswr < 5.0:
-                band_rating['passes'] = False
-                band_rating['efficiency_percent'] = 65.0
-            else:
-                band_rating['passes'] = False
-                band_rating['efficiency_percent'] = 40.0
-
-            result['band_ratings'].append(band_rating)
-            efficiency_factors.append(band_rating['efficiency_percent'])
+                'passes': passes[i],
+                'efficiency_percent': efficiency_factors[i]
+            })
 
         result['bands_met'] = sum(1 for r in result['band_ratings'] if r['passes'])
         result['efficiency_estimate'] = sum(efficiency_factors) / len(efficiency_factors) if efficiency_factors else 0.0
@@ -321,6 +390,14 @@ class ElectricalConstraints:
 
         return result
 
+class SubstrateMaterial(NamedTuple):
+    """Electrical and thermal properties of one substrate material."""
+    dielectric_constant: float
+    loss_tangent: float
+    thermal_conductivity: float  # W/m·K
+    typical_thickness_mils: int
+
+
 class MaterialProperties:
     """Define material properties for copper and substrate."""
 
@@ -329,27 +406,27 @@ class MaterialProperties:
     COPPER_THICKNESS_MILS = 1.4
     COPPER_SURFACE_RESISTANCE = 0.00005  # ohms per square
 
-    # Common substrate materials
-    SUBSTRATE_MATERIALS = {
-        'fr4': {
-            'dielectric_constant': 4.3,
-            'loss_tangent': 0.025,
-            'thermal_conductivity': 0.25,  # W/m·K
-            'typical_thickness_mils': 62
-        },
-        'rogers_ro4003c': {
-            'dielectric_constant': 3.55,
-            'loss_tangent': 0.0027,
-            'thermal_conductivity': 0.71,
-            'typical_thickness_mils': 32
-        },
-        'ceramic': {
-            'dielectric_constant': 9.8,
-            'loss_tangent': 0.0001,
-            'thermal_conductivity': 2.0,
-            'typical_thickness_mils': 25
-        }
-    }
+    # Common substrate materials (read-only; fields by attribute, e.g. .loss_tangent)
+    SUBSTRATE_MATERIALS = MappingProxyType({
+        'fr4': SubstrateMaterial(
+            dielectric_constant=4.3,
+            loss_tangent=0.025,
+            thermal_conductivity=0.25,
+            typical_thickness_mils=62
+        ),
+        'rogers_ro4003c': SubstrateMaterial(
+            dielectric_constant=3.55,
+            loss_tangent=0.0027,
+            thermal_conductivity=0.71,
+            typical_thickness_mils=32
+        ),
+        'ceramic': SubstrateMaterial(
+            dielectric_constant=9.8,
+            loss_tangent=0.0001,
+            thermal_conductivity=2.0,
+            typical_thickness_mils=25
+        )
+    })
 
     @staticmethod
     def recommend_substrate(frequency_range: Tuple[float, float]) -> Dict[str, Any]:
@@ -381,5 +458,3 @@ class MaterialProperties:
             recommendation['reasoning'] = 'Cost-effective standard substrate suitable for low frequencies'
 
         return recommendation
-
-logger.info("Substrate and manufacturing constraints initialized")
@@ -14,14 +14,18 @@ full-wave simulation.
 """
 import math
 import os
+import shutil
 import sys
 import time
 import functools
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
+import numpy as np
 from loguru import logger
 
+from antenna_kernels import vswr_from_reflection
+
 # --- Windows console can't encode the emoji used throughout the app; force
 #     UTF-8 so log/print statements don't crash with a 'charmap' codec error. ---
 for _stream in (sys.stdout, sys.stderr):
@@ -39,16 +43,17 @@ class PerformanceMonitor:
         """Decorator to measure execution time."""
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            # Monotonic integer clock; converted to seconds only when logging
+            start_ns = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
-                duration = time.time() - start_time
-                logger.info(f"Performance: {func.__name__} took {duration:.4f}s")
-                return result
             except Exception as e:
-                duration = time.time() - start_time
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
                 logger.error(f"Performance: {func.__name__} failed after {duration:.4f}s: {str(e)}")
                 raise
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.info(f"Performance: {func.__name__} took {duration:.4f}s")
+            return result
         return wrapper
 
 
@@ -74,8 +79,8 @@ def _rotate_logs_on_startup():
 
 # Configure logging with rotation
 _rotate_logs_on_startup()
+# Console output comes from loguru's default stderr sink
 logger.add("antenna_designer.log", rotation="10 MB", retention="7 days", level="INFO", encoding="utf-8")
-logger.add(lambda msg: print(msg, end=""), level="INFO")  # Console output
 
 
 def validate_system_configuration() -> dict:
@@ -136,26 +141,57 @@ class AntennaAnalyzer:
 
         Returns lengths in metres. Returns zeros if no wires are found.
         """
+        # Simulation, radiation pattern and feed advice all parse the same
+        # geometry, so the parse is memoized; callers get their own copy
+        return dict(AntennaAnalyzer._parse_geometry_cached(nec_input or "")[0])
+
+    @classmethod
+    def clear_parse_cache(cls) -> None:
+        """Drop memoized geometry parses."""
+        cls._parse_geometry_cached.cache_clear()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_geometry_cached(nec_input: str) -> Tuple[Dict[str, float], Tuple[float, float, float]]:
+        """Scan the GW cards once for parse_geometry and radiation_pattern.
+
+        Returns (parse_geometry result, (net dx, net dy, planar length)) with
+        the x-y sums in inches. A card counts toward the dipole moment when its
+        x/y coordinates parse, and toward the geometry only when all of its
+        values do. Memoized per geometry string; do not mutate the result.
+        """
         total_len_m = 0.0
         radii = []
         xs, ys, zs = [], [], []
+        vx = vy = planar_len = 0.0
 
-        for raw in (nec_input or "").splitlines():
+        for raw in nec_input.splitlines():
+            # Only GW cards matter; skip other cards before tokenizing
+            if raw.lstrip()[:2].upper() != "GW":
+                continue
             parts = raw.split()
             if len(parts) >= 9 and parts[0].upper() == "GW":
                 try:
-                    x1, y1, z1 = float(parts[3]), float(parts[4]), float(parts[5])
-                    x2, y2, z2 = float(parts[6]), float(parts[7]), float(parts[8])
+                    x1, y1, x2, y2 = float(parts[3]), float(parts[4]), float(parts[6]), float(parts[7])
+                except ValueError:
+                    continue
+                # Net dipole moment = vector sum of segments (folds that reverse cancel).
+                vx += (x2 - x1); vy += (y2 - y1)
+                planar_len += math.hypot(x2 - x1, y2 - y1)
+
+                try:
+                    z1, z2 = float(parts[5]), float(parts[8])
                     radius = float(parts[9]) if len(parts) >= 10 else 0.008
-                except (ValueError, IndexError):
+                except ValueError:
                     continue
                 seg_len = math.dist((x1, y1, z1), (x2, y2, z2)) * _INCH_M
                 total_len_m += seg_len
                 radii.append(abs(radius) * _INCH_M)
                 xs += [x1, x2]; ys += [y1, y2]; zs += [z1, z2]
 
+        dipole = (vx, vy, planar_len)
         if not xs:
-            return {'total_len_m': 0.0, 'radius_m': 0.0, 'extent_m': 0.0, 'wire_count': 0}
+            return {'total_len_m': 0.0, 'radius_m': 0.0, 'extent_m': 0.0, 'wire_count': 0}, dipole
 
         # Largest straight-line extent of the structure (the dimension that
         # actually radiates; meander folds largely cancel and do not add to it).
@@ -169,7 +205,7 @@ class AntennaAnalyzer:
             'radius_m': max(avg_radius, 1e-5),
             'extent_m': max(extent_in * _INCH_M, 1e-4),
             'wire_count': len(radii),
-        }
+        }, dipole
 
     @staticmethod
     def estimate(geom: Dict[str, float], frequency_mhz: float,
@@ -253,22 +289,10 @@ class AntennaAnalyzer:
         Returns dict: angles_deg, gain_dbi (list), max_gain_dbi, max_gain_dir_deg,
         null_dirs_deg, directionality (0=omni..1=figure-8), pattern_type, axis_deg.
         """
-        geom = AntennaAnalyzer.parse_geometry(nec_input)
+        # One memoized GW scan gives both the geometry and the net dipole moment
+        geom, (vx, vy, total) = AntennaAnalyzer._parse_geometry_cached(nec_input or "")
         peak = AntennaAnalyzer.estimate(geom, frequency_mhz).get('gain_dbi', -50.0)
 
-        # Net dipole moment = vector sum of segments (folds that reverse cancel).
-        vx = vy = 0.0
-        total = 0.0
-        for raw in (nec_input or "").splitlines():
-            p = raw.split()
-            if len(p) >= 9 and p[0].upper() == "GW":
-                try:
-                    x1, y1, x2, y2 = float(p[3]), float(p[4]), float(p[6]), float(p[7])
-                except (ValueError, IndexError):
-                    continue
-                vx += (x2 - x1); vy += (y2 - y1)
-                total += math.hypot(x2 - x1, y2 - y1)
-
         net = math.hypot(vx, vy)
         directionality = max(0.0, min(1.0, net / total)) if total > 0 else 0.0
         axis_deg = math.degrees(math.atan2(vy, vx)) if net > 1e-9 else 0.0
@@ -306,6 +330,12 @@ class AntennaAnalyzer:
         }
 
 
+# Standard unun transformers as (ratio name, input impedance in ohms), and
+# each one's impedance ratio against the 50 ohm feed
+STANDARD_UNUNS = (('1:1', 50), ('4:1', 200), ('9:1', 450), ('16:1', 800), ('49:1', 2450))
+_UNUN_RATIOS = tuple(z / 50.0 for _, z in STANDARD_UNUNS)
+
+
 def compute_feed_requirements(resonators: List[Dict]) -> List[Dict]:
     """Advise on feed impedance, matching and balun for each resonator.
 
@@ -327,7 +357,6 @@ def compute_feed_requirements(resonators: List[Dict]) -> List[Dict]:
     Returns:
         list of advice dicts (one per resonator).
     """
-    standard_ununs = [('1:1', 50), ('4:1', 200), ('9:1', 450), ('16:1', 800), ('49:1', 2450)]
     advice = []
     for r in resonators or []:
         freq = r.get('freq_mhz', 0) or 0
@@ -344,7 +373,8 @@ def compute_feed_requirements(resonators: List[Dict]) -> List[Dict]:
         balanced = False
         need_match = R < 25.0 or R > 100.0 or abs(X) > 25.0
         ratio_needed = max(R, 1.0) / 50.0
-        best_unun = min(standard_ununs, key=lambda s: abs(s[1] / 50.0 - ratio_needed))
+        best = min(range(len(_UNUN_RATIOS)), key=lambda i: abs(_UNUN_RATIOS[i] - ratio_needed))
+        best_unun = STANDARD_UNUNS[best]
 
         if balanced:
             balun = "1:1 current balun required (balanced element fed by unbalanced coax)."
@@ -386,10 +416,22 @@ class NEC2Interface:
     The public API (``run_simulation``) is identical in both modes.
     """
 
+    # Install locations checked when nec2 is not on PATH
+    NEC2_LOCATIONS = ("/usr/local/bin/nec2", "/usr/bin/nec2", "C:\\NEC2\\nec2.exe", "./nec2.exe")
+    # Executable found by _discover_nec2; None until a search succeeds
+    _discovered_nec2: Optional[str] = None
+
+    # Cards wrapped around the geometry in every NEC input deck
+    FREQUENCY_CARD = "FR 0 1 0 0 %s 0"
+    EXCITATION_CARD = "EX 0 1 1 0 1.0"
+    DECK_TRAILER = "XQ\nEN"  # Execute, then end of deck
+
     def __init__(self, nec2_path: Optional[str] = None):
         self.nec2_path = self._find_nec2_executable(nec2_path)
         self.temp_dir = Path("temp")
         self.temp_dir.mkdir(exist_ok=True)
+        # NEC file path -> (geometry, frequency) last written there
+        self._written_decks: Dict[Path, Tuple[str, float]] = {}
         if self.nec2_path:
             logger.info(f"NEC2 interface initialized with executable: {self.nec2_path}")
         else:
@@ -397,15 +439,28 @@ class NEC2Interface:
 
     def _find_nec2_executable(self, nec2_path: Optional[str]) -> Optional[str]:
         """Locate a NEC2 executable, returning None if none is available."""
-        candidates = [nec2_path] if nec2_path else []
-        candidates += [
-            "/usr/local/bin/nec2", "/usr/bin/nec2",
-            "C:\\NEC2\\nec2.exe", "./nec2.exe",
-        ]
-        for path in candidates:
-            if path and Path(path).exists():
-                return path
-        return None
+        if nec2_path and Path(nec2_path).exists():
+            return nec2_path
+        return self._discover_nec2()
+
+    @classmethod
+    def _discover_nec2(cls) -> Optional[str]:
+        """Search PATH, then the well-known install locations.
+
+        Only a successful lookup is remembered, so a solver installed or
+        added to PATH later is picked up by the next NEC2Interface.
+        """
+        if cls._discovered_nec2 is None:
+            found = shutil.which("nec2")
+            if not found:
+                found = next((path for path in cls.NEC2_LOCATIONS if Path(path).exists()), None)
+            cls._discovered_nec2 = found
+        return cls._discovered_nec2
+
+    @classmethod
+    def clear_discovery_cache(cls) -> None:
+        """Forget the remembered NEC2 executable, e.g. after it was moved or removed."""
+        cls._discovered_nec2 = None
 
     @PerformanceMonitor.measure_time
     def run_simulation(self, nec_input: str, frequencies: List[float]) -> dict:
@@ -440,9 +495,14 @@ class NEC2Interface:
     def _write_nec_file(self, nec_input: str, frequency: float) -> Optional[Path]:
         """Write a complete NEC input deck to temp/ for export/debugging."""
         input_file = self.temp_dir / f"antenna_{frequency:.1f}.nec"
+        # Optimizers re-run the same geometry and frequencies; skip rewriting
+        # a deck that is already on disk unchanged
+        if self._written_decks.get(input_file) == (nec_input, frequency) and input_file.exists():
+            return input_file
         try:
             with open(input_file, 'w', encoding='utf-8') as f:
                 f.write(self._format_nec2_input(nec_input, frequency))
+            self._written_decks[input_file] = (nec_input, frequency)
             return input_file
         except OSError as e:
             logger.error(f"Could not write NEC file {input_file}: {e}")
@@ -450,10 +510,7 @@ class NEC2Interface:
 
     def _format_nec2_input(self, nec_input: str, frequency: float) -> str:
         """Wrap geometry cards with frequency, excitation and execute cards."""
-        frequency_card = f"FR 0 1 0 0 {frequency} 0"
-        excitation_card = "EX 0 1 1 0 1.0"
-        compute_card = "XQ"
-        return f"{frequency_card}\n{nec_input}\n{excitation_card}\n{compute_card}\nEN"
+        return '\n'.join((self.FREQUENCY_CARD % frequency, nec_input, self.EXCITATION_CARD, self.DECK_TRAILER))
 
 
 class AntennaMetrics:
@@ -461,7 +518,14 @@ class AntennaMetrics:
 
     @staticmethod
     def calculate_vswr(reflection_coefficient: complex) -> float:
-        """Calculate VSWR from reflection coefficient."""
+        """Calculate VSWR from reflection coefficient.
+
+        Also accepts a NumPy array of coefficients (e.g. a frequency sweep) and
+        then returns a float array of the same shape from one compiled pass.
+        """
+        if isinstance(reflection_coefficient, np.ndarray):
+            gammas = np.ascontiguousarray(reflection_coefficient, dtype=np.complex128)
+            return vswr_from_reflection(gammas.ravel()).reshape(gammas.shape)
         try:
             gamma = abs(reflection_coefficient)
             if gamma >= 1.0:
@@ -1,57 +1,102 @@
 #!/usr/bin/env python3
 """Debug script to visualize what geometry is being generated."""
 
+import io
+import itertools
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent))
 
 from presets import BandPresets
 from design_generator import AntennaDesignGenerator
 from core import NEC2Interface
+from antenna_kernels import wire_directions
+
+# Printed names indexed by antenna_kernels WIRE_* orientation code
+DIRECTION_NAMES = ("HORIZONTAL", "VERTICAL", "DIAGONAL/U-TURN")
+
+
+def iter_lines(text):
+    """Yield the lines of text one at a time without building a list of them.
+
+    LF, CRLF and CR all end a line, as with str.splitlines, and a trailing
+    newline does not produce an extra empty line.
+    """
+    return (line.rstrip('\n') for line in io.StringIO(text, newline=None))
+
+
+def parse_row(row):
+    """Convert one row of coordinate tokens to floats, or None if any is malformed."""
+    try:
+        return [float(v) for v in row]
+    except ValueError:
+        return None
+
 
 # Initialize
 nec = NEC2Interface()
 generator = AntennaDesignGenerator(nec)
 
 # Generate WiFi band
-wifi_band = BandPresets.get_all_bands()['wifi_2g_extend']
+wifi_band = BandPresets.get('wifi_2g_extend')
 result = generator.generate_design(wifi_band)
 
 geometry = result.get('geometry', '')
 
-print(f"Design Type: {result.get('design_type')}")
-print(f"Geometry length: {len(geometry)} chars")
-print(f"\nFirst 50 lines of geometry:")
-print("="*60)
+# Output lines are collected and written in one go at the end
+out = []
+out.append(f"Design Type: {result.get('design_type')}")
+out.append(f"Geometry length: {len(geometry)} chars")
+out.append(f"\nFirst 50 lines of geometry:")
+out.append("="*60)
 
-lines = geometry.split('\n')[:50]
-for i, line in enumerate(lines, 1):
+for i, line in enumerate(itertools.islice(iter_lines(geometry), 50), 1):
     if line.strip():
-        print(f"{i:3d}: {line}")
+        out.append(f"{i:3d}: {line}")
+
+# Stream the GW cards (picked by their leading tag) straight into wire rows of
+# x1, y1, x2, y2 tokens, numbered by GW line; cards too short to carry both
+# endpoints are counted but skipped. Only the first 8 tokens (through y2) are
+# needed, so splitting stops there and leaves z2, radius and anything after
+# as one unparsed tail.
+gw_count = 0
+wire_numbers = []
+rows = []
+for gw_count, line in enumerate((l for l in iter_lines(geometry) if l.lstrip()[:2] == 'GW'), 1):
+    parts = line.split(None, 8)
+    if len(parts) >= 8:
+        wire_numbers.append(gw_count)
+        rows.append((parts[3], parts[4], parts[6], parts[7]))
 
-print(f"\n{'='*60}")
-print(f"Total GW lines: {len([l for l in geometry.split('\\n') if 'GW' in l])}")
+out.append(f"\n{'='*60}")
+out.append(f"Total GW lines: {gw_count}")
 
 # Parse and analyze geometry
-print(f"\n{'='*60}")
-print("Analyzing wire segments:")
-print(f"{'='*60}")
+out.append(f"\n{'='*60}")
+out.append("Analyzing wire segments:")
+out.append(f"{'='*60}")
 
-gw_lines = [l for l in geometry.split('\n') if l.strip().startswith('GW')]
-for i, line in enumerate(gw_lines[:10], 1):
-    parts = line.split()
-    if len(parts) >= 8:
-        x1, y1 = float(parts[3]), float(parts[4])
-        x2, y2 = float(parts[6]), float(parts[7])
-        length = ((x2-x1)**2 + (y2-y1)**2)**0.5
-
-        # Determine if this is horizontal, vertical, or diagonal
-        if abs(y2-y1) < 0.01:
-            direction = "HORIZONTAL"
-        elif abs(x2-x1) < 0.01:
-            direction = "VERTICAL"
-        else:
-            direction = "DIAGONAL/U-TURN"
-
-        print(f"{i:2d}. {direction:15s} ({x1:7.3f},{y1:7.3f}) -> ({x2:7.3f},{y2:7.3f})  len={length:6.3f}")
+# Every wire as one (N, 4) array of x1, y1, x2, y2
+try:
+    coords = np.array(rows, dtype=np.float64).reshape(-1, 4)
+except ValueError:
+    # Malformed number somewhere - fall back to skipping just the bad cards
+    parsed = [(i, parse_row(row)) for i, row in zip(wire_numbers, rows)]
+    wire_numbers = [i for i, row in parsed if row is not None]
+    coords = np.array([row for _, row in parsed if row is not None], dtype=np.float64).reshape(-1, 4)
+    out.append(f"Skipped {len(rows) - len(wire_numbers)} GW card(s) with malformed coordinates")
+
+# Lengths and orientation (horizontal, vertical or diagonal) for all wires
+# in one pass, compiled with Numba when it is installed
+lengths, directions = wire_directions(coords)
+
+# Show the wires among the first 10 GW lines
+shown = sum(1 for i in wire_numbers[:10] if i <= 10)
+for i, (x1, y1, x2, y2), length, direction in zip(wire_numbers, coords[:shown].tolist(),
+                                                lengths[:shown].tolist(), directions[:shown].tolist()):
+    out.append(f"{i:2d}. {DIRECTION_NAMES[direction]:15s} ({x1:7.3f},{y1:7.3f}) -> ({x2:7.3f},{y2:7.3f})  len={length:6.3f}")
+
+sys.stdout.write('\n'.join(out) + '\n')
@@ -884,25 +884,28 @@ class GeometryValidation:
 
         try:
             lines = geometry.split('\n')
-            coords = []
+            # Endpoint coordinates collected straight into per-axis lists
+            x_coords = []
+            y_coords = []
 
             for line in lines:
+                # Only GW cards carry coordinates; skip other cards before tokenizing
+                if line.lstrip()[:2] != 'GW':
+                    continue
                 parts = line.split()
                 if len(parts) >= 8 and parts[0] == 'GW':  # Wire geometry
                     # Extract coordinates: x1,y1,z1,x2,y2,z2
                     try:
                         x1, y1 = float(parts[3]), float(parts[4])
                         x2, y2 = float(parts[6]), float(parts[7])
-                        coords.extend([(x1, y1), (x2, y2)])
                     except (ValueError, IndexError):
                         continue
+                    x_coords += (x1, x2)
+                    y_coords += (y1, y2)
 
-            if coords:
-                x_coords = [c[0] for c in coords]
-                y_coords = [c[1] for c in coords]
-
-                validation['max_x'] = max(abs(min(x_coords)), abs(max(x_coords)))
-                validation['max_y'] = max(abs(min(y_coords)), abs(max(y_coords)))
+            if x_coords:
+                validation['max_x'] = float(np.abs(np.asarray(x_coords)).max())
+                validation['max_y'] = float(np.abs(np.asarray(y_coords)).max())
 
                 if validation['max_x'] > max_width / 2:
                     validation['within_bounds'] = False
@@ -1899,6 +1902,27 @@ class AdvancedMeanderTrace:
         except Exception:
             return 10.0  # Default fallback
 
+    def extract_target_length_batch(self, frequencies_mhz: np.ndarray, kc: float = 0.90) -> np.ndarray:
+        """Vectorized extract_target_length for an array of frequencies.
+
+        Applies calculate_target_length's arithmetic to the whole array in the
+        same operation order, so each element matches the scalar helper.
+
+        Args:
+            frequencies_mhz: Frequencies in MHz
+            kc: Coupling/loading factor (0.80-0.98)
+
+        Returns:
+            np.ndarray: Target lengths in inches (0.0 for non-positive frequencies)
+        """
+        frequency_hz = np.asarray(frequencies_mhz, dtype=np.float64) * 1e6
+        valid = frequency_hz > 0
+        frequency_mhz = np.where(valid, frequency_hz, 1e6) / 1e6
+
+        wavelength_inches = 11802.7 / frequency_mhz
+        target_length_meters = np.where(valid, (wavelength_inches / 2) * kc * 0.0254, 0.0)
+        return target_length_meters * 39.3701  # Convert meters to inches
+
     def _calculate_unified_constraints(self, frequencies: List[float],
                                       base_constraints: Dict[str, Any] = None) -> Dict[str, Any]:
         """Calculate unified constraints for substrate-filling meander.
@@ -7,8 +7,10 @@ and debug antenna trace layouts.
 """
 
 import sys
-from typing import List, Tuple
-import math
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
 
 # Force UTF-8 so emoji in console output don't crash on Windows (cp1252).
 for _stream in (sys.stdout, sys.stderr):
@@ -18,7 +20,7 @@ for _stream in (sys.stdout, sys.stderr):
         pass
 
 
-def parse_nec2_geometry(geometry_text: str) -> List[Tuple[float, float, float, float]]:
+def parse_nec2_geometry(geometry_text: str) -> "ParsedGeometry":
     """
     Parse NEC2 geometry string and extract wire segments.
 
@@ -26,69 +28,147 @@ def parse_nec2_geometry(geometry_text: str) -> List[Tuple[float, float, float, f
         geometry_text: NEC2 format geometry string with GW cards
 
     Returns:
-        List of (x1, y1, x2, y2) tuples for each wire segment
+        ParsedGeometry wrapping an (N, 4) array of (x1, y1, x2, y2) rows,
+        one per wire segment
     """
-    segments = []
+    # GW format: GW tag segs x1 y1 z1 x2 y2 z2 radius -> keep x1 y1 z1 x2 y2
+    rows = [parts[3:8] for parts in (line.split() for line in geometry_text.split('\n')
+                                     if line.lstrip().startswith('GW'))
+            if len(parts) >= 8]
+
+    try:
+        coords = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    except ValueError:
+        # Malformed number somewhere - fall back to skipping the bad rows
+        parsed = (_parse_row(row) for row in rows)
+        coords = np.array([row for row in parsed if row is not None],
+                          dtype=np.float64).reshape(-1, 5)
+
+    return ParsedGeometry(coords[:, [0, 1, 3, 4]])
+
+
+def _parse_row(row: List[str]) -> Optional[List[float]]:
+    """Convert one GW coordinate row to floats, or None if it is malformed."""
+    try:
+        return [float(v) for v in row]
+    except ValueError:
+        return None
+
 
-    for line in geometry_text.split('\n'):
-        line = line.strip()
-        if not line.startswith('GW'):
-            continue
+def _as_coords(segments) -> np.ndarray:
+    """View segments (array or list of 4-tuples) as an (N, 4) float array."""
+    return np.asarray(segments, dtype=np.float64).reshape(-1, 4)
 
-        parts = line.split()
-        if len(parts) < 8:
-            continue
 
-        try:
-            # GW format: GW tag segs x1 y1 z1 x2 y2 z2 radius
-            x1 = float(parts[3])
-            y1 = float(parts[4])
-            x2 = float(parts[6])
-            y2 = float(parts[7])
+class SegmentScan(NamedTuple):
+    """Bounds, length and orientation counts gathered in one pass."""
+    min_x: float
+    min_y: float
+    max_x: float
+    max_y: float
+    total_length: float
+    horizontal: int
+    vertical: int
 
-            segments.append((x1, y1, x2, y2))
-        except (ValueError, IndexError):
-            continue
 
-    return segments
+def _scan_segments(coords: np.ndarray) -> SegmentScan:
+    """Scan a non-empty (N, 4) coordinate array once for analyze_pattern.
 
+    Horizontal/vertical segments are those within 0.01" of axis-aligned;
+    a segment that is both (a point) counts as horizontal.
+    """
+    dx = coords[:, 2] - coords[:, 0]
+    dy = coords[:, 3] - coords[:, 1]
+    xs = coords[:, 0::2]
+    ys = coords[:, 1::2]
+
+    is_horizontal = np.abs(dy) < 0.01
+    horizontal = int(is_horizontal.sum())
+    vertical = int((~is_horizontal & (np.abs(dx) < 0.01)).sum())
+
+    return SegmentScan(float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()),
+                       float(np.hypot(dx, dy).sum()), horizontal, vertical)
+
+
+@dataclass
+class ParsedGeometry:
+    """Parsed (N, 4) segment coordinates with the pattern scan memoized.
+
+    Behaves like the coordinate array for len(), iteration, indexing and
+    np.asarray(). Bounds, total length and orientation counts are scanned
+    on first use and reused by analyze_pattern, draw_ascii_meander and
+    generate_simple_svg.
+    """
+    coords: np.ndarray
+    _scan: Optional[SegmentScan] = field(default=None, repr=False, compare=False)
 
-def calculate_bounds(segments: List[Tuple[float, float, float, float]]) -> Tuple[float, float, float, float]:
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __iter__(self):
+        return iter(self.coords)
+
+    def __getitem__(self, index):
+        return self.coords[index]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.coords if dtype is None else self.coords.astype(dtype, copy=False)
+
+    def scan(self) -> SegmentScan:
+        """Bounds, total length and orientation counts (geometry must be non-empty)."""
+        if self._scan is None:
+            self._scan = _scan_segments(self.coords)
+        return self._scan
+
+    def as_tuples(self) -> List[Tuple[float, float, float, float]]:
+        """Segments as a list of (x1, y1, x2, y2) tuples."""
+        return [tuple(row) for row in self.coords.tolist()]
+
+
+def calculate_bounds(segments: np.ndarray) -> Tuple[float, float, float, float]:
     """Calculate bounding box for segments."""
-    if not segments:
+    if len(segments) == 0:
         return 0, 0, 0, 0
 
-    all_x = [x for seg in segments for x in [seg[0], seg[2]]]
-    all_y = [y for seg in segments for y in [seg[1], seg[3]]]
+    if isinstance(segments, ParsedGeometry):
+        scan = segments.scan()
+        return scan.min_x, scan.min_y, scan.max_x, scan.max_y
 
-    return min(all_x), min(all_y), max(all_x), max(all_y)
+    coords = _as_coords(segments)
+    xs = coords[:, 0::2]
+    ys = coords[:, 1::2]
 
+    return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
 
-def calculate_total_length(segments: List[Tuple[float, float, float, float]]) -> float:
+
+def calculate_total_length(segments: np.ndarray) -> float:
     """Calculate total trace length from segments."""
-    total = 0.0
-    for x1, y1, x2, y2 in segments:
-        length = math.sqrt((x2-x1)**2 + (y2-y1)**2)
-        total += length
-    return total
+    if isinstance(segments, ParsedGeometry) and len(segments):
+        return segments.scan().total_length
+
+    coords = _as_coords(segments)
+    return float(np.hypot(coords[:, 2] - coords[:, 0], coords[:, 3] - coords[:, 1]).sum())
 
 
-def draw_ascii_meander(segments: List[Tuple[float, float, float, float]], width: int = 80, height: int = 20) -> str:
+def draw_ascii_meander(segments: np.ndarray, width: int = 80, height: int = 20) -> str:
     """
     Draw ASCII art representation of meander pattern.
 
     Args:
-        segments: List of (x1, y1, x2, y2) wire segments
+        segments: (N, 4) array (or list) of (x1, y1, x2, y2) wire segments
         width: ASCII art width in characters
         height: ASCII art height in characters
 
     Returns:
         String with ASCII art representation
     """
-    if not segments:
+    if len(segments) == 0:
         return "No segments to draw"
 
-    # Calculate bounds
+    # Convert once; bounds and the drawing loop share the same array
+    if not isinstance(segments, ParsedGeometry):
+        segments = ParsedGeometry(_as_coords(segments))
+    coords = segments.coords
     min_x, min_y, max_x, max_y = calculate_bounds(segments)
 
     width_range = max_x - min_x
@@ -97,11 +177,11 @@ def draw_ascii_meander(segments: List[Tuple[float, float, float, float]], width:
     if width_range == 0 or height_range == 0:
         return "Invalid geometry bounds"
 
-    # Create grid
-    grid = [[' ' for _ in range(width)] for _ in range(height)]
+    # Create grid: one byte per cell, row-major
+    grid = bytearray(b' ' * (width * height))
 
     # Draw segments
-    for x1, y1, x2, y2 in segments:
+    for x1, y1, x2, y2 in coords.tolist():
         # Normalize to grid coordinates
         gx1 = int((x1 - min_x) / width_range * (width - 1))
         gy1 = int((y1 - min_y) / height_range * (height - 1))
@@ -118,70 +198,63 @@ def draw_ascii_meander(segments: List[Tuple[float, float, float, float]], width:
         gy1 = max(0, min(height - 1, gy1))
         gy2 = max(0, min(height - 1, gy2))
 
-        # Draw segment
+        # Draw segment (coordinates are clamped, so whole runs fit the grid)
         dx = abs(gx2 - gx1)
         dy = abs(gy2 - gy1)
 
         if dx > dy:
-            # Horizontal-ish segment
-            for x in range(min(gx1, gx2), max(gx1, gx2) + 1):
-                if 0 <= x < width and 0 <= gy1 < height:
-                    grid[gy1][x] = '-'
+            # Horizontal-ish segment: contiguous run along row gy1
+            row = gy1 * width
+            grid[row + min(gx1, gx2):row + max(gx1, gx2) + 1] = b'-' * (dx + 1)
         else:
-            # Vertical-ish segment
-            for y in range(min(gy1, gy2), max(gy1, gy2) + 1):
-                if 0 <= gx1 < width and 0 <= y < height:
-                    grid[y][gx1] = '|'
+            # Vertical-ish segment: strided run down column gx1
+            grid[min(gy1, gy2) * width + gx1:max(gy1, gy2) * width + gx1 + 1:width] = b'|' * (dy + 1)
 
     # Convert grid to string
     result = []
     result.append("+" + "-" * width + "+")
-    for row in grid:
-        result.append("|" + "".join(row) + "|")
+    for i in range(height):
+        result.append("|" + grid[i * width:(i + 1) * width].decode('ascii') + "|")
     result.append("+" + "-" * width + "+")
 
     return "\n".join(result)
 
 
-def generate_simple_svg(segments: List[Tuple[float, float, float, float]],
+def generate_simple_svg(segments: np.ndarray,
                        filename: str = "meander_debug.svg",
                        scale: float = 100.0) -> str:
     """
     Generate simple SVG file for visualization.
 
     Args:
-        segments: List of (x1, y1, x2, y2) wire segments
+        segments: (N, 4) array (or list) of (x1, y1, x2, y2) wire segments
         filename: Output SVG filename
         scale: SVG units per inch (default 100)
 
     Returns:
         SVG content as string
     """
-    if not segments:
+    if len(segments) == 0:
         return "<?xml version=\"1.0\"?><svg xmlns=\"http://www.w3.org/2000/svg\"/>"
 
-    # Calculate bounds
+    # Convert once; bounds, transform and total length share the same array
+    if not isinstance(segments, ParsedGeometry):
+        segments = ParsedGeometry(_as_coords(segments))
+    coords = segments.coords
     min_x, min_y, max_x, max_y = calculate_bounds(segments)
 
     margin = 0.2  # 0.2 inch margin
     width = (max_x - min_x + 2 * margin) * scale
     height = (max_y - min_y + 2 * margin) * scale
 
-    # Transform coordinates
-    def transform(x, y):
-        return (
-            (x - min_x + margin) * scale,
-            height - ((y - min_y + margin) * scale)  # Flip Y for SVG
-        )
+    # Transform all coordinates at once (flip Y for SVG)
+    transformed = np.empty_like(coords)
+    transformed[:, 0::2] = (coords[:, 0::2] - min_x + margin) * scale
+    transformed[:, 1::2] = height - (coords[:, 1::2] - min_y + margin) * scale
 
     # Generate SVG paths
-    paths = []
-    for x1, y1, x2, y2 in segments:
-        tx1, ty1 = transform(x1, y1)
-        tx2, ty2 = transform(x2, y2)
-
-        path = f'<line x1="{tx1:.2f}" y1="{ty1:.2f}" x2="{tx2:.2f}" y2="{ty2:.2f}" stroke="black" stroke-width="2"/>'
-        paths.append(path)
+    line_template = '<line x1="{:.2f}" y1="{:.2f}" x2="{:.2f}" y2="{:.2f}" stroke="black" stroke-width="2"/>'
+    paths = [line_template.format(*row) for row in transformed.tolist()]
 
     paths_str = '\n    '.join(paths)
 
@@ -204,7 +277,7 @@ def generate_simple_svg(segments: List[Tuple[float, float, float, float]],
     Bounds: {max_x - min_x:.3f}" x {max_y - min_y:.3f}"
   </text>
   <text x="10" y="35" font-family="Arial" font-size="8" fill="black">
-    Segments: {len(segments)}
+    Segments: {len(coords)}
   </text>
   <text x="10" y="50" font-family="Arial" font-size="8" fill="black">
     Total length: {calculate_total_length(segments):.3f}"
@@ -219,7 +292,7 @@ def generate_simple_svg(segments: List[Tuple[float, float, float, float]],
     return svg
 
 
-def analyze_pattern(segments: List[Tuple[float, float, float, float]]) -> dict:
+def analyze_pattern(segments: np.ndarray) -> dict:
     """
     Analyze meander pattern and return statistics.
 
@@ -233,25 +306,18 @@ def analyze_pattern(segments: List[Tuple[float, float, float, float]]) -> dict:
         - vertical_count: Number of vertical segments
         - pattern_type: "meander" or "straight" or "unknown"
     """
-    if not segments:
+    if len(segments) == 0:
         return {"error": "No segments"}
 
-    total_length = calculate_total_length(segments)
-    bounds = calculate_bounds(segments)
+    if isinstance(segments, ParsedGeometry):
+        scan = segments.scan()
+    else:
+        scan = _scan_segments(_as_coords(segments))
+    bounds = (scan.min_x, scan.min_y, scan.max_x, scan.max_y)
     min_x, min_y, max_x, max_y = bounds
-
-    # Count horizontal vs vertical segments
-    horizontal = 0
-    vertical = 0
-
-    for x1, y1, x2, y2 in segments:
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-
-        if dy < 0.01:  # Horizontal (within tolerance)
-            horizontal += 1
-        elif dx < 0.01:  # Vertical (within tolerance)
-            vertical += 1
+    total_length = scan.total_length
+    horizontal = scan.horizontal
+    vertical = scan.vertical
 
     # Determine pattern type
     if vertical > horizontal * 0.3:
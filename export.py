@@ -1,5 +1,10 @@
 """Vector export for laser etching - SVG and DXF formats."""
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+import copy
+import functools
+from array import array
+from itertools import chain
 import os
 import math
 import platform
@@ -8,12 +13,40 @@ import webbrowser
 from datetime import datetime
 from pathlib import Path
 from loguru import logger
+import numpy as np
 import ezdxf
 from svglib.svglib import svg2rlg
 from reportlab.graphics import renderPDF
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 
+from antenna_kernels import WIDTH_ERROR, WIDTH_GOOD, WIDTH_WARNING, classify_widths, segment_extents
+
+# Values per segment in flat segment storage: x1, y1, x2, y2, radius
+SEGMENT_STRIDE = 5
+
+# Connectivity endpoint keys are coordinates in units of 1/CONNECTIVITY_KEY_SCALE inch
+CONNECTIVITY_KEY_SCALE = 10000
+
+# Status label for each antenna_kernels WIDTH_* code
+TRACE_STATUS_NAMES = np.array(['good', 'warning', 'error'])
+
+# Static <defs> block shared by every exported SVG
+SVG_STYLE_DEFS = """  
+  <defs>
+    <style>
+      .dimension-text { font-family: Arial, sans-serif; font-size: 12px; fill: #333; }
+      .label-text { font-family: Arial, sans-serif; font-size: 14px; font-weight: bold; fill: #000; }
+      .title-text { font-family: Arial, sans-serif; font-size: 18px; font-weight: bold; fill: #000; }
+      .subtitle-text { font-family: Arial, sans-serif; font-size: 12px; fill: #666; }
+      .dimension-line { stroke: #666; stroke-width: 1; fill: none; }
+      .feed-point { fill: red; stroke: darkred; stroke-width: 2; }
+      .solder-pad { fill: black; stroke: black; stroke-width: 1; }
+    </style>
+  </defs>
+  
+"""
+
 class ExportError(Exception):
     """Custom exception for export failures."""
     pass
@@ -21,6 +54,18 @@ class ExportError(Exception):
 class VectorExporter:
     """Export optimized antenna designs to vector formats for laser etching."""
 
+    # Stroke/text colour for each trace validation status
+    TRACE_STATUS_COLORS = {
+        'good': 'black',
+        'warning': 'orange',
+        'error': 'red'
+    }
+
+    # Manufacturing message templates, formatted only for traces that fail a check
+    TRACE_WIDTH_BELOW_MINIMUM = "Trace width {:.1f} mil below absolute minimum (5 mil)"
+    TRACE_WIDTH_BELOW_RECOMMENDED = "Trace width {:.1f} mil below recommended minimum (8 mil)"
+    TRACE_WIDTH_TOO_THICK = "Trace width {:.1f} mil very thick (may reduce performance)"
+
     def __init__(self, output_dir: str = "exports"):
         """Initialize exporter with output directory."""
         self.output_dir = Path(output_dir)
@@ -182,80 +227,166 @@ class VectorExporter:
 
     def _parse_geometry(self, geometry: str) -> List[tuple]:
         """Parse NEC2 geometry string into wire segments."""
+        flat = self._parse_geometry_cached(geometry, self.min_trace_width)
+        # Regroup the flat (x1, y1, x2, y2, radius) stream into segment tuples
+        return list(zip(*[iter(flat)] * SEGMENT_STRIDE))
+
+    def _parse_geometry_array(self, geometry: str) -> np.ndarray:
+        """Parse NEC2 geometry into a read-only (N, 5) array of x1, y1, x2, y2, radius.
+
+        The array is a zero-copy view of the memoized parse, so it must not be
+        written to.
+        """
+        flat = self._parse_geometry_cached(geometry, self.min_trace_width)
+        segments = np.frombuffer(flat, dtype=np.float64).reshape(-1, SEGMENT_STRIDE)
+        segments.flags.writeable = False
+        return segments
+
+    @classmethod
+    def clear_parse_cache(cls) -> None:
+        """Drop memoized geometry parses."""
+        cls._parse_geometry_cached.cache_clear()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _parse_geometry_cached(geometry: str, default_radius: float) -> array:
+        """Parse NEC2 geometry once per (geometry, default radius) pair.
+
+        Validation, export and thumbnail paths all re-parse the same string,
+        so results are memoized. Each entry is stored as a flat array('d') of
+        x1, y1, x2, y2, radius values (SEGMENT_STRIDE per segment) rather than
+        a tuple of float objects, keeping the cache compact. Do not mutate it.
+        """
         try:
             segments = []
+            gw_cards = []  # (slot in segments, line, tokens)
             lines = geometry.split('\n')
 
             tag_offset = 0
             for line in lines:
-                if not line.strip():
+                # Only GW and SP cards carry geometry; skip CM/GE/blank lines before tokenizing
+                if line.lstrip()[:2] not in ('GW', 'SP'):
                     continue
 
                 parts = line.split()
                 if len(parts) >= 8 and parts[0] == 'GW':
-                    # Parse GW card: GW tag segments x1 y1 z1 x2 y2 z2 radius
-                    try:
-                        tag = int(float(parts[1]))
-                        segments_count = int(float(parts[2]))
-                        x1 = float(parts[3])
-                        y1 = float(parts[4])
-                        z1 = float(parts[5])  # Usually 0 for planar antennas
-                        x2 = float(parts[6])
-                        y2 = float(parts[7])
-                        z2 = float(parts[8])  # Usually 0 for planar antennas
-                        radius = float(parts[9]) if len(parts) > 9 else self.min_trace_width
-
-                        segments.append((x1, y1, x2, y2, radius))
-
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"Failed to parse GW line: {line} - {str(e)}")
-                        continue
+                    # GW cards are converted in one batch below; hold their place
+                    gw_cards.append((len(segments), line, parts))
+                    segments.append(None)
 
                 elif len(parts) >= 4 and parts[0] == 'SP':
                     # Handle surface patches (SP cards)
                     try:
                         # Convert surface patch to outline wires
-                        patch_segments = self._surface_patch_to_wires(parts)
+                        patch_segments = VectorExporter._surface_patch_to_wires(parts, default_radius)
                         segments.extend(patch_segments)
                     except Exception as e:
                         logger.warning(f"Failed to parse SP line: {line} - {str(e)}")
                         continue
 
+            if len(gw_cards) == len(segments):
+                # GW-only geometry (the common case): copy the converted values
+                # straight into the flat buffer without building tuples
+                values = VectorExporter._gw_card_values(gw_cards, default_radius)
+                if values is not None:
+                    flat = array('d')
+                    flat.frombytes(values.tobytes())
+                    logger.debug(f"Parsed {len(gw_cards)} wire segments from geometry")
+                    return flat
+
+            for (slot, _, _), segment in zip(gw_cards, VectorExporter._convert_gw_cards(gw_cards, default_radius)):
+                segments[slot] = segment
+            segments = [segment for segment in segments if segment is not None]
+
             logger.debug(f"Parsed {len(segments)} wire segments from geometry")
-            return segments
+            return array('d', chain.from_iterable(segments))
 
         except Exception as e:
             logger.error(f"Geometry parsing error: {str(e)}")
-            return []
+            return array('d')
 
-    def _surface_patch_to_wires(self, sp_parts: List[str]) -> List[tuple]:
-        """Convert surface patch (SP) to outline wires."""
+    @staticmethod
+    def _gw_card_values(gw_cards: List[tuple], default_radius: float) -> Optional[np.ndarray]:
+        """Convert tokenized GW cards to a C-contiguous (N, 5) array in one NumPy pass.
+
+        Returns None if any card is malformed, including cards with fewer
+        than the 9 tokens up to z2.
+        """
+        # A short card would make the rows ragged (or, worse, line up into a
+        # wrong-but-valid shape), so leave those to the per-card path
+        if any(len(parts) < 9 for _, _, parts in gw_cards):
+            return None
         try:
-            # SP format: SP tag segments x1 y1 z1 x2 y2 z2 x3 y3 z3 x4 y4 z4
-            coords = []
-            i = 3  # Skip SP tag segments
-            while i < len(sp_parts) - 2:
-                x = float(sp_parts[i])
-                y = float(sp_parts[i+1])
-                z = float(sp_parts[i+2])  # Usually 0 for planar
-                coords.append((x, y))
-                i += 3
-
-            # Create wire segments for patch outline
-            segments = []
-            radius = self.min_trace_width
+            # GW tag segments x1 y1 z1 x2 y2 z2 [radius]
+            values = np.array([parts[1:9] + [parts[9] if len(parts) > 9 else default_radius]
+                               for _, _, parts in gw_cards], dtype=np.float64)
+        except ValueError:
+            return None
+        # Tag and segment count only need to survive int(float(...)) as in the
+        # per-card path, which truncates fractions but rejects inf and nan
+        if not np.isfinite(values[:, :2]).all():
+            return None
+        return values[:, [2, 3, 5, 6, 8]]
 
-            if len(coords) >= 3:
-                for i in range(len(coords)):
-                    x1, y1 = coords[i]
-                    x2, y2 = coords[(i + 1) % len(coords)]
-                    segments.append((x1, y1, x2, y2, radius))
+    @staticmethod
+    def _convert_gw_cards(gw_cards: List[tuple], default_radius: float) -> List[Optional[tuple]]:
+        """Convert tokenized GW cards to (x1, y1, x2, y2, radius) tuples.
 
-            return segments
+        All cards go through one NumPy string-to-float conversion. If any card
+        is malformed the batch falls back to per-card conversion, which skips
+        (None) and logs just the bad lines.
+        """
+        values = VectorExporter._gw_card_values(gw_cards, default_radius)
+        if values is not None:
+            return [tuple(row) for row in values.tolist()]
 
-        except Exception as e:
-            logger.warning(f"Surface patch to wires conversion error: {str(e)}")
-            return []
+        return [VectorExporter._convert_gw_card(line, parts, default_radius)
+                for _, line, parts in gw_cards]
+
+    @staticmethod
+    def _convert_gw_card(line: str, parts: List[str], default_radius: float) -> Optional[tuple]:
+        """Convert one tokenized GW card, or log it and return None if malformed."""
+        # Parse GW card: GW tag segments x1 y1 z1 x2 y2 z2 radius
+        try:
+            tag = int(float(parts[1]))
+            segments_count = int(float(parts[2]))
+            x1 = float(parts[3])
+            y1 = float(parts[4])
+            z1 = float(parts[5])  # Usually 0 for planar antennas
+            x2 = float(parts[6])
+            y2 = float(parts[7])
+            z2 = float(parts[8])  # Usually 0 for planar antennas
+            radius = float(parts[9]) if len(parts) > 9 else default_radius
+
+            return (x1, y1, x2, y2, radius)
+
+        except (ValueError, IndexError) as e:
+            logger.warning(f"Failed to parse GW line: {line} - {str(e)}")
+            return None
+
+    @staticmethod
+    def _surface_patch_to_wires(sp_parts: List[str], radius: float) -> List[tuple]:
+        """Convert surface patch (SP) to outline wires."""
+        # SP format: SP tag segments x1 y1 z1 x2 y2 z2 x3 y3 z3 x4 y4 z4
+        coords = []
+        i = 3  # Skip SP tag segments
+        while i < len(sp_parts) - 2:
+            x = float(sp_parts[i])
+            y = float(sp_parts[i+1])
+            z = float(sp_parts[i+2])  # Usually 0 for planar
+            coords.append((x, y))
+            i += 3
+
+        # Create wire segments for patch outline
+        segments = []
+
+        if len(coords) >= 3:
+            for i in range(len(coords)):
+                x1, y1 = coords[i]
+                x2, y2 = coords[(i + 1) % len(coords)]
+                segments.append((x1, y1, x2, y2, radius))
+
+        return segments
 
     def _generate_svg_content(self, wire_segments: List[tuple],
                             metadata: Optional[Dict] = None) -> str:
@@ -288,31 +419,31 @@ class VectorExporter:
             width = (max_x - min_x + 2 * margin + label_space) * self.svg_scale
             height = (max_y - min_y + 2 * margin) * self.svg_scale
 
-            # Transform function for coordinates
+            # Transform function for coordinates (scale resolved once, not per call)
+            svg_scale = self.svg_scale
+
             def transform(x, y):
-                return ((x - min_x + margin) * self.svg_scale,
-                       height - ((y - min_y + margin) * self.svg_scale))
+                return ((x - min_x + margin) * svg_scale,
+                       height - ((y - min_y + margin) * svg_scale))
 
             # Generate SVG paths for antenna traces with color coding based on validation
-            paths = []
-            validation_colors = {
-                'good': 'black',
-                'warning': 'orange',
-                'error': 'red'
-            }
+            validation_colors = self.TRACE_STATUS_COLORS
 
-            for i, segment in enumerate(wire_segments):
-                x1, y1, x2, y2, radius = segment
-                tx1, ty1 = transform(x1, y1)
-                tx2, ty2 = transform(x2, y2)
-                stroke_width = max(radius * self.svg_scale, 2.0)  # Minimum 2 unit for visibility
+            # Transform and format every endpoint in one pass, then fill a single template
+            seg = np.asarray(wire_segments, dtype=np.float64).reshape(-1, 5)
+            fmt = f'%.{self.precision}f'
+            txs = np.char.mod(fmt, (seg[:, [0, 2]] - min_x + margin) * svg_scale)
+            tys = np.char.mod(fmt, height - ((seg[:, [1, 3]] - min_y + margin) * svg_scale))
+            stroke_widths = np.maximum(seg[:, 4] * svg_scale, 2.0).tolist()  # Minimum 2 unit for visibility
 
-                # Get validation status for this trace
-                validation_status = trace_validation['trace_status'][i] if i < len(trace_validation['trace_status']) else 'good'
-                stroke_color = validation_colors.get(validation_status, 'black')
+            # Get validation status for each trace
+            trace_status = trace_validation['trace_status']
+            stroke_colors = [validation_colors.get(trace_status[i] if i < len(trace_status) else 'good', 'black')
+                             for i in range(len(seg))]
 
-                path = f'M {tx1:.{self.precision}f} {ty1:.{self.precision}f} L {tx2:.{self.precision}f} {ty2:.{self.precision}f}'
-                paths.append(f'<path d="{path}" stroke="{stroke_color}" stroke-width="{stroke_width}" fill="none"/>')
+            path_template = '<path d="M {} {} L {} {}" stroke="{}" stroke-width="{}" fill="none"/>'
+            paths = list(map(path_template.format, txs[:, 0], tys[:, 0], txs[:, 1], tys[:, 1],
+                             stroke_colors, stroke_widths))
 
             # Combine all paths
             paths_str = '\n    '.join(paths)
@@ -320,47 +451,35 @@ class VectorExporter:
             # Generate professional labels and annotations including trace validation and contact pads
             annotations = self._generate_svg_annotations(wire_segments, transform, total_width, total_height, metadata, trace_validation)
 
-            # Generate SVG with professional layout
-            svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg width="{width:.1f}" height="{height:.1f}" viewBox="0 0 {width:.1f} {height:.1f}" xmlns="http://www.w3.org/2000/svg">
-  <title>PCB Antenna Design - Laser Etching Ready</title>
-  <desc>{self._svg_description(metadata)}</desc>
-  
-  <defs>
-    <style>
-      .dimension-text {{ font-family: Arial, sans-serif; font-size: 12px; fill: #333; }}
-      .label-text {{ font-family: Arial, sans-serif; font-size: 14px; font-weight: bold; fill: #000; }}
-      .title-text {{ font-family: Arial, sans-serif; font-size: 18px; font-weight: bold; fill: #000; }}
-      .subtitle-text {{ font-family: Arial, sans-serif; font-size: 12px; fill: #666; }}
-      .dimension-line {{ stroke: #666; stroke-width: 1; fill: none; }}
-      .feed-point {{ fill: red; stroke: darkred; stroke-width: 2; }}
-      .solder-pad {{ fill: black; stroke: black; stroke-width: 1; }}
-    </style>
-  </defs>
-  
-  <!-- Background -->
-  <rect width="{width:.1f}" height="{height:.1f}" fill="white" stroke="black" stroke-width="2"/>
-  
-  <!-- Grid lines for alignment (optional) -->
-  <g stroke="#e0e0e0" stroke-width="0.5" opacity="0.5">
-    {self._generate_grid_lines(width, height, transform)}
-  </g>
-  
-  <!-- Antenna wire segments -->
-  <g stroke-linecap="round" stroke-linejoin="round" id="antenna-traces">
-    {paths_str}
-  </g>
-  
-  <!-- Professional annotations -->
-  {annotations}
-
-  <!-- Predicted radiation pattern overlay -->
-  {self._generate_pattern_overlay(transform, metadata, width, height)}
-
-  <!-- Connection / feed points -->
-  {self._generate_feed_markers(transform, metadata)}
-
-</svg>'''
+            # Assemble the document from pieces and join once at the end
+            svg_parts = [
+                '<?xml version="1.0" encoding="UTF-8"?>\n',
+                f'<svg width="{width:.1f}" height="{height:.1f}" viewBox="0 0 {width:.1f} {height:.1f}" xmlns="http://www.w3.org/2000/svg">\n',
+                '  <title>PCB Antenna Design - Laser Etching Ready</title>\n',
+                f'  <desc>{self._svg_description(metadata)}</desc>\n',
+                SVG_STYLE_DEFS,
+                '  <!-- Background -->\n',
+                f'  <rect width="{width:.1f}" height="{height:.1f}" fill="white" stroke="black" stroke-width="2"/>\n',
+                '  \n',
+                '  <!-- Grid lines for alignment (optional) -->\n',
+                '  <g stroke="#e0e0e0" stroke-width="0.5" opacity="0.5">\n    ',
+                self._generate_grid_lines(width, height, transform),
+                '\n  </g>\n',
+                '  \n',
+                '  <!-- Antenna wire segments -->\n',
+                '  <g stroke-linecap="round" stroke-linejoin="round" id="antenna-traces">\n    ',
+                paths_str,
+                '\n  </g>\n',
+                '  \n',
+                '  <!-- Professional annotations -->\n  ',
+                annotations,
+                '\n\n  <!-- Predicted radiation pattern overlay -->\n  ',
+                self._generate_pattern_overlay(transform, metadata, width, height),
+                '\n\n  <!-- Connection / feed points -->\n  ',
+                self._generate_feed_markers(transform, metadata),
+                '\n\n</svg>',
+            ]
+            svg = ''.join(svg_parts)
 
             return svg
 
@@ -438,11 +557,14 @@ class VectorExporter:
         r_max = 0.42 * min(svg_w, svg_h)
         r_min = 0.12 * r_max                    # inner radius so nulls remain visible
 
+        r_span = r_max - r_min
+        radians, cos, sin = math.radians, math.cos, math.sin
+
         def polar(angle_deg, gain_dbi):
             frac = (gain_dbi - gmin) / span
-            rr = r_min + frac * (r_max - r_min)
-            a = math.radians(angle_deg)
-            return cx + rr * math.cos(a), cy - rr * math.sin(a)
+            rr = r_min + frac * r_span
+            a = radians(angle_deg)
+            return cx + rr * cos(a), cy - rr * sin(a)
 
         pts = [polar(a, g) for a, g in zip(angles, gains)]
         path = "M " + " L ".join(f"{x:.1f} {y:.1f}" for x, y in pts) + " Z"
@@ -475,11 +597,15 @@ class VectorExporter:
         out.append('</g>')
         return '\n  '.join(out)
 
-    def _validate_trace_widths(self, wire_segments: List[tuple]) -> Dict[str, Any]:
+    def _validate_trace_widths(self, wire_segments: List[tuple],
+                               include_messages: bool = True) -> Dict[str, Any]:
         """Validate trace widths for manufacturability.
 
         Args:
             wire_segments: List of wire segment tuples (x1, y1, x2, y2, radius)
+            include_messages: Build the per-trace manufacturing_errors and
+                manufacturing_warnings text; pass False when only the status
+                and summary fields are needed
 
         Returns:
             dict: Validation results with status per trace and summary
@@ -496,28 +622,39 @@ class VectorExporter:
                 'overall_status': 'good'
             }
 
-            trace_widths_mils = []
-
-            for segment in wire_segments:
-                x1, y1, x2, y2, radius = segment
-                trace_width_mils = radius * 1000  # Convert inches to mils
-                trace_widths_mils.append(trace_width_mils)
-
-                # Determine validation status
-                if trace_width_mils < 5.0:
-                    status = 'error'
-                    validation['manufacturing_errors'].append(f"Trace width {trace_width_mils:.1f} mil below absolute minimum (5 mil)")
-                elif trace_width_mils < 8.0:
-                    status = 'warning'
-                    validation['manufacturing_warnings'].append(f"Trace width {trace_width_mils:.1f} mil below recommended minimum (8 mil)")
-                elif trace_width_mils > 50.0:
-                    status = 'warning'
-                    validation['manufacturing_warnings'].append(f"Trace width {trace_width_mils:.1f} mil very thick (may reduce performance)")
-                else:
-                    status = 'good'
-
-                validation['trace_status'].append(status)
-                validation['trace_widths_mils'].append(trace_width_mils)
+            # Classify every trace at once
+            widths = np.asarray(wire_segments, dtype=np.float64).reshape(-1, 5)[:, 4] * 1000  # inches -> mils
+            trace_widths_mils = widths.tolist()
+            validation['trace_widths_mils'] = trace_widths_mils
+
+            if len(widths) and widths.min() == widths.max():
+                # Typical design: every trace shares one radius, so classify it once
+                code = int(classify_widths(widths[:1])[0])
+                has_error = code == WIDTH_ERROR
+                has_warning = code == WIDTH_WARNING
+                validation['trace_status'] = [str(TRACE_STATUS_NAMES[code])] * len(widths)
+                if code != WIDTH_GOOD and include_messages:
+                    message = self._trace_width_message(trace_widths_mils[0], code)
+                    key = 'manufacturing_errors' if code == WIDTH_ERROR else 'manufacturing_warnings'
+                    validation[key] = [message] * len(widths)
+            else:
+                codes = classify_widths(widths)
+                is_error = codes == WIDTH_ERROR
+                is_warning = codes == WIDTH_WARNING
+                validation['trace_status'] = TRACE_STATUS_NAMES[codes].tolist()
+
+                if include_messages:
+                    # Build messages only for the traces that need them (kept in trace order)
+                    validation['manufacturing_errors'] = [
+                        self._trace_width_message(trace_widths_mils[i], WIDTH_ERROR)
+                        for i in np.flatnonzero(is_error)]
+                    validation['manufacturing_warnings'] = [
+                        self._trace_width_message(trace_widths_mils[i], WIDTH_WARNING)
+                        for i in np.flatnonzero(is_warning)]
+                # Codes are ordered by severity, so the worst one decides the summary
+                worst = int(codes.max()) if len(codes) else WIDTH_GOOD
+                has_error = worst >= WIDTH_ERROR
+                has_warning = worst >= WIDTH_WARNING
 
             # Calculate summary statistics
             if trace_widths_mils:
@@ -526,9 +663,9 @@ class VectorExporter:
                 validation['avg_trace_width'] = sum(trace_widths_mils) / len(trace_widths_mils)
 
             # Determine overall status
-            if any(s == 'error' for s in validation['trace_status']):
+            if has_error:
                 validation['overall_status'] = 'error'
-            elif any(s == 'warning' for s in validation['trace_status']):
+            elif has_warning:
                 validation['overall_status'] = 'warning'
             else:
                 validation['overall_status'] = 'good'
@@ -547,6 +684,15 @@ class VectorExporter:
                 'manufacturing_errors': [f"Validation error: {str(e)}"]
             }
 
+    @classmethod
+    def _trace_width_message(cls, width_mils: float, code: int) -> str:
+        """Manufacturing message for a trace classified as WIDTH_ERROR or WIDTH_WARNING."""
+        if code == WIDTH_ERROR:
+            return cls.TRACE_WIDTH_BELOW_MINIMUM.format(width_mils)
+        if width_mils < 8.0:
+            return cls.TRACE_WIDTH_BELOW_RECOMMENDED.format(width_mils)
+        return cls.TRACE_WIDTH_TOO_THICK.format(width_mils)
+
     def _generate_svg_annotations(self, wire_segments: List[tuple], transform_func,
                                total_width: float, total_height: float, metadata: Optional[Dict] = None,
                                trace_validation: Optional[Dict] = None) -> str:
@@ -617,13 +763,13 @@ class VectorExporter:
                 width_counts = Counter(f"{w:.4f}" for w in trace_validation['trace_widths_mils'])
                 typical_width = float(width_counts.most_common(1)[0][0])
 
-                # Look for pads (segments with radius >= 2x typical width)
+                # Look for pads (segments with radius >= 2x typical width) in one scan
                 pad_threshold = typical_width * 1.8
-                pad_count = sum(1 for w in trace_validation['trace_widths_mils'] if w >= pad_threshold)
+                pad_widths = [w for w in trace_validation['trace_widths_mils'] if w >= pad_threshold]
+                pad_count = len(pad_widths)
 
                 if pad_count > 0:
                     # Calculate average pad size
-                    pad_widths = [w for w in trace_validation['trace_widths_mils'] if w >= pad_threshold]
                     avg_pad_width = sum(pad_widths) / len(pad_widths)
                     pad_ratio = avg_pad_width / typical_width
 
@@ -675,52 +821,36 @@ class VectorExporter:
             return ""
 
     def _generate_grid_lines(self, width: float, height: float, transform_func) -> str:
-        """Generate alignment grid lines."""
-        try:
-            grid_lines = []
-            grid_spacing = 0.5 * self.scale_factor  # 0.5 inch grid
-            
-            # Vertical lines
-            for x in range(0, int(width), int(grid_spacing)):
-                grid_lines.append(f'<line x1="{x}" y1="0" x2="{x}" y2="{height}"/>')
-            
-            # Horizontal lines
-            for y in range(0, int(height), int(grid_spacing)):
-                grid_lines.append(f'<line x1="0" y1="{y}" x2="{width}" y2="{y}"/>')
-            
-            return '\n    '.join(grid_lines)
-            
-        except Exception as e:
-            logger.warning(f"Failed to generate grid lines: {str(e)}")
+        """Generate alignment grid lines as a single SVG path."""
+        grid_spacing = int(0.5 * self.scale_factor)  # 0.5 inch grid
+        
+        # Vertical lines, then horizontal lines, as subpaths of one <path>
+        commands = [f'M {x} 0 V {height}' for x in range(0, int(width), grid_spacing)]
+        commands.extend(f'M 0 {y} H {width}' for y in range(0, int(height), grid_spacing))
+        
+        if not commands:
             return ""
+        return f'<path d="{" ".join(commands)}" fill="none"/>'
 
     def _generate_dimension_lines(self, total_width: float, total_height: float, transform_func) -> str:
         """Generate dimension lines for the antenna."""
-        try:
-            dimensions = []
-            
-            # Get transformed coordinates for dimension lines
-            origin_x, origin_y = transform_func(0, 0)
-            
-            # Width dimension line (bottom)
-            width_start = transform_func(-total_width/2, -total_height/2 - 0.3)
-            width_end = transform_func(total_width/2, -total_height/2 - 0.3)
-            dimensions.append(f'<line x1="{width_start[0]:.1f}" y1="{width_start[1]:.1f}" x2="{width_end[0]:.1f}" y2="{width_end[1]:.1f}" class="dimension-line"/>')
-            dimensions.append(f'<line x1="{width_start[0]:.1f}" y1="{width_start[1]-5:.1f}" x2="{width_start[0]:.1f}" y2="{width_start[1]+5:.1f}" class="dimension-line"/>')
-            dimensions.append(f'<line x1="{width_end[0]:.1f}" y1="{width_end[1]-5:.1f}" x2="{width_end[0]:.1f}" y2="{width_end[1]+5:.1f}" class="dimension-line"/>')
-            
-            # Height dimension line (right side)
-            height_start = transform_func(total_width/2 + 0.3, -total_height/2)
-            height_end = transform_func(total_width/2 + 0.3, total_height/2)
-            dimensions.append(f'<line x1="{height_start[0]:.1f}" y1="{height_start[1]:.1f}" x2="{height_end[0]:.1f}" y2="{height_end[1]:.1f}" class="dimension-line"/>')
-            dimensions.append(f'<line x1="{height_start[0]-5:.1f}" y1="{height_start[1]:.1f}" x2="{height_start[0]+5:.1f}" y2="{height_start[1]:.1f}" class="dimension-line"/>')
-            dimensions.append(f'<line x1="{height_end[0]-5:.1f}" y1="{height_end[1]:.1f}" x2="{height_end[0]+5:.1f}" y2="{height_end[1]:.1f}" class="dimension-line"/>')
-            
-            return '\n  '.join(dimensions)
-            
-        except Exception as e:
-            logger.warning(f"Failed to generate dimension lines: {str(e)}")
-            return ""
+        dimensions = []
+        
+        # Width dimension line (bottom)
+        width_start = transform_func(-total_width/2, -total_height/2 - 0.3)
+        width_end = transform_func(total_width/2, -total_height/2 - 0.3)
+        dimensions.append(f'<line x1="{width_start[0]:.1f}" y1="{width_start[1]:.1f}" x2="{width_end[0]:.1f}" y2="{width_end[1]:.1f}" class="dimension-line"/>')
+        dimensions.append(f'<line x1="{width_start[0]:.1f}" y1="{width_start[1]-5:.1f}" x2="{width_start[0]:.1f}" y2="{width_start[1]+5:.1f}" class="dimension-line"/>')
+        dimensions.append(f'<line x1="{width_end[0]:.1f}" y1="{width_end[1]-5:.1f}" x2="{width_end[0]:.1f}" y2="{width_end[1]+5:.1f}" class="dimension-line"/>')
+        
+        # Height dimension line (right side)
+        height_start = transform_func(total_width/2 + 0.3, -total_height/2)
+        height_end = transform_func(total_width/2 + 0.3, total_height/2)
+        dimensions.append(f'<line x1="{height_start[0]:.1f}" y1="{height_start[1]:.1f}" x2="{height_end[0]:.1f}" y2="{height_end[1]:.1f}" class="dimension-line"/>')
+        dimensions.append(f'<line x1="{height_start[0]-5:.1f}" y1="{height_start[1]:.1f}" x2="{height_start[0]+5:.1f}" y2="{height_start[1]:.1f}" class="dimension-line"/>')
+        dimensions.append(f'<line x1="{height_end[0]-5:.1f}" y1="{height_end[1]:.1f}" x2="{height_end[0]+5:.1f}" y2="{height_end[1]:.1f}" class="dimension-line"/>')
+        
+        return '\n  '.join(dimensions)
 
     def _get_empty_svg(self) -> str:
         """Generate empty SVG for error cases."""
@@ -841,113 +971,204 @@ class VectorExporter:
             logger.error(f"Failed to open exports folder: {str(e)}")
             return False
 
+@dataclass
+class EtchingValidation:
+    """Result of EtchingValidator.validate_for_etching.
+
+    Slotted so the many results produced during optimization stay small.
+    Fields can also be used by key (validation['warnings'],
+    validation.get('etching_ready'), keys(), items(), iteration and
+    validation['etching_ready'] = False) as with the dict it replaced.
+    Adding keys that are not fields is not supported and raises KeyError.
+    """
+    __slots__ = ('minimum_feature_size', 'trace_width_consistent', 'isolation_clearance',
+                 'total_area', 'complexity_score', 'warnings', 'etching_ready',
+                 'element_count', 'contact_pads_present', 'contact_pad_size_valid',
+                 'contact_pad_trace_width_ratio', 'component_count', 'validated')
+
+    minimum_feature_size: bool
+    trace_width_consistent: bool
+    isolation_clearance: bool
+    total_area: float
+    complexity_score: int
+    warnings: List[str]
+    etching_ready: bool
+    element_count: int
+    contact_pads_present: bool
+    contact_pad_size_valid: bool
+    contact_pad_trace_width_ratio: float
+    component_count: Optional[int]  # None until connectivity has been checked
+    validated: bool  # Set once the checks complete; stays False if validation errored
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def keys(self):
+        """Field names, in declaration order."""
+        return self.__slots__
+
+    def items(self):
+        """(field name, value) pairs, in declaration order."""
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style lookup returning default for unknown fields."""
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict of all fields."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
 class EtchingValidator:
     """Validate exported designs for laser etching feasibility."""
 
+    # Warning templates, formatted only when the corresponding check fails
+    FRAGMENTATION_WARNING = "High fragmentation detected: {} disconnected parts"
+    ISOLATED_SEGMENTS_WARNING = "Found {} isolated single-segment wires"
+    CONTACT_PADS_NOTE = "Contact pads detected: {} pads, size ratio: {:.1f}x trace width"
+
     @staticmethod
-    def validate_for_etching(geometry: str) -> Dict:
-        """Check design against etching constraints."""
-        validation = {
-            'minimum_feature_size': True,
-            'trace_width_consistent': True,
-            'isolation_clearance': True,
-            'total_area': 0.0,
-            'complexity_score': 0,
-            'warnings': [],
-            'etching_ready': True,
-            'element_count': 0,  # Add missing key
-            'contact_pads_present': False,
-            'contact_pad_size_valid': True,
-            'contact_pad_trace_width_ratio': 1.0
-        }
+    def validate_for_etching(geometry: str) -> EtchingValidation:
+        """Check design against etching constraints.
 
+        Results are memoized per geometry string (the UI and design generator
+        re-validate the same design); each caller gets its own shallow copy.
+        All fields but ``warnings`` are immutable, so only that list is copied.
+        """
         try:
-            from export import VectorExporter
-            exporter = VectorExporter()
-            segments = exporter._parse_geometry(geometry)
-
-            if not segments:
-                validation['warnings'].append("No valid antenna elements found in geometry")
-                validation['etching_ready'] = False
-                return validation
-
-            min_radius = float('inf')
-            trace_widths = []
-            total_length = 0
-            wire_count = 0
-
-            for x1, y1, x2, y2, radius in segments:
-                min_radius = min(min_radius, radius)
-                trace_widths.append(radius)
-                wire_count += 1
-                
-                # Calculate actual segment length
-                segment_length = ((x2 - x1)**2 + (y2 - y1)**2)**0.5
-                total_length += segment_length
-
-            validation['element_count'] = wire_count
-            validation['minimum_feature_size'] = min_radius >= 0.003  # 3 mil minimum
-            validation['trace_width_consistent'] = len(set(f"{w:.3f}" for w in trace_widths)) <= 3
-            validation['total_area'] = total_length * 0.005  # Rough estimate
-            validation['complexity_score'] = min(wire_count // 10, 4)  # Cap at 4
-
-            # Check for contact pads
-            contact_pad_info = EtchingValidator._check_contact_pads(segments, trace_widths)
-            validation['contact_pads_present'] = contact_pad_info['has_contact_pads']
-            validation['contact_pad_size_valid'] = contact_pad_info['size_valid']
-            validation['contact_pad_trace_width_ratio'] = contact_pad_info['ratio']
-
-            # Generate warnings
-            if not validation['minimum_feature_size']:
-                validation['warnings'].append("Some features may be below minimum laser resolution")
-                validation['etching_ready'] = False
-
-            if wire_count == 0:
-                validation['warnings'].append("No wire segments found in geometry")
-                validation['etching_ready'] = False
-            elif wire_count < 3:
-                validation['warnings'].append("Very simple antenna design - may not be effective")
-
-            if wire_count > 50:
-                validation['warnings'].append("High complexity may require multiple etching passes")
-
-            if min_radius < 0.005:  # 5 mil minimum for good quality
-                validation['warnings'].append("Trace width below recommended minimum (5 mil)")
-
-            # Check dimensions
-            dims = EtchingValidator._calculate_dimensions(segments)
-            if dims['width'] < 0.1 or dims['height'] < 0.01:
-                validation['warnings'].append("Antenna dimensions suspiciously small")
-                validation['etching_ready'] = False
-            
-            # Check connectivity
-            connectivity = EtchingValidator._check_connectivity(segments)
-            validation['component_count'] = connectivity['components']
-            if connectivity['components'] > 5 and wire_count > 10:
-                # Allow some disconnected elements (parasitic) but warn if too many fragmented parts
-                validation['warnings'].append(f"High fragmentation detected: {connectivity['components']} disconnected parts")
-            
-            if connectivity['isolated_segments'] > 0:
-                validation['warnings'].append(f"Found {connectivity['isolated_segments']} isolated single-segment wires")
-
-            # Contact pad specific warnings
-            if validation['contact_pads_present']:
-                if not validation['contact_pad_size_valid']:
-                    validation['warnings'].append("Contact pads may be too small for reliable soldering")
-                    validation['etching_ready'] = False
-                else:
-                    validation['warnings'].append(f"Contact pads detected: {contact_pad_info['count']} pads, "
-                                                f"size ratio: {contact_pad_info['ratio']:.1f}x trace width")
-
+            cached = EtchingValidator._validate_cached(geometry)
         except Exception as e:
-            validation['warnings'].append(f"Validation error: {str(e)}")
-            validation['etching_ready'] = False
+            # Failures are reported but never memoized, so a transient error
+            # does not stick to this geometry
+            validation = EtchingValidator._blank_validation()
+            validation.warnings.append(f"Validation error: {str(e)}")
+            validation.etching_ready = False
+            return validation
 
+        validation = copy.copy(cached)
+        validation.warnings = list(validation.warnings)
         return validation
 
     @staticmethod
-    def _check_contact_pads(segments: List[tuple], trace_widths: List[float]) -> Dict:
-        """Check for contact pads and validate their size."""
+    def _blank_validation() -> EtchingValidation:
+        """A result with every check passing and nothing validated yet."""
+        return EtchingValidation(
+            minimum_feature_size=True,
+            trace_width_consistent=True,
+            isolation_clearance=True,
+            total_area=0.0,
+            complexity_score=0,
+            warnings=[],
+            etching_ready=True,
+            element_count=0,
+            contact_pads_present=False,
+            contact_pad_size_valid=True,
+            contact_pad_trace_width_ratio=1.0,
+            component_count=None,
+            validated=False
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def _validate_cached(geometry: str) -> EtchingValidation:
+        """Run the etching checks for one geometry string.
+
+        Exceptions propagate to validate_for_etching, so only completed
+        validations are cached.
+        """
+        validation = EtchingValidator._blank_validation()
+
+        from export import VectorExporter
+        exporter = VectorExporter()
+        seg_array = exporter._parse_geometry_array(geometry)
+
+        if len(seg_array) == 0:
+            validation.warnings.append("No valid antenna elements found in geometry")
+            validation.etching_ready = False
+            validation.validated = True
+            return validation
+
+        # Bounds, total length and minimum radius in one pass
+        min_x, min_y, max_x, max_y, total_length, min_radius = segment_extents(seg_array)
+        trace_widths = seg_array[:, 4].tolist()
+        wire_count = len(seg_array)
+
+        validation.element_count = wire_count
+        validation.minimum_feature_size = min_radius >= 0.003  # 3 mil minimum
+        validation.trace_width_consistent = len(set(f"{w:.3f}" for w in trace_widths)) <= 3
+        validation.total_area = total_length * 0.005  # Rough estimate
+        validation.complexity_score = min(wire_count // 10, 4)  # Cap at 4
+
+        # Check for contact pads
+        contact_pad_info = EtchingValidator._check_contact_pads(trace_widths)
+        validation.contact_pads_present = contact_pad_info['has_contact_pads']
+        validation.contact_pad_size_valid = contact_pad_info['size_valid']
+        validation.contact_pad_trace_width_ratio = contact_pad_info['ratio']
+
+        # Generate warnings
+        if not validation.minimum_feature_size:
+            validation.warnings.append("Some features may be below minimum laser resolution")
+            validation.etching_ready = False
+
+        if wire_count == 0:
+            validation.warnings.append("No wire segments found in geometry")
+            validation.etching_ready = False
+        elif wire_count < 3:
+            validation.warnings.append("Very simple antenna design - may not be effective")
+
+        if wire_count > 50:
+            validation.warnings.append("High complexity may require multiple etching passes")
+
+        if min_radius < 0.005:  # 5 mil minimum for good quality
+            validation.warnings.append("Trace width below recommended minimum (5 mil)")
+
+        # Check dimensions
+        if max_x - min_x < 0.1 or max_y - min_y < 0.01:
+            validation.warnings.append("Antenna dimensions suspiciously small")
+            validation.etching_ready = False
+        
+        # Check connectivity
+        connectivity = EtchingValidator._check_connectivity(seg_array)
+        validation.component_count = connectivity['components']
+        if connectivity['components'] > 5 and wire_count > 10:
+            # Allow some disconnected elements (parasitic) but warn if too many fragmented parts
+            validation.warnings.append(
+                EtchingValidator.FRAGMENTATION_WARNING.format(connectivity['components']))
+        
+        if connectivity['isolated_segments'] > 0:
+            validation.warnings.append(
+                EtchingValidator.ISOLATED_SEGMENTS_WARNING.format(connectivity['isolated_segments']))
+
+        # Contact pad specific warnings
+        if validation.contact_pads_present:
+            if not validation.contact_pad_size_valid:
+                validation.warnings.append("Contact pads may be too small for reliable soldering")
+                validation.etching_ready = False
+            else:
+                validation.warnings.append(EtchingValidator.CONTACT_PADS_NOTE.format(
+                    contact_pad_info['count'], contact_pad_info['ratio']))
+
+        validation.validated = True
+
+        return validation
+
+    @staticmethod
+    def _check_contact_pads(trace_widths: List[float]) -> Dict:
+        """Check for contact pads and validate their size from per-segment radii."""
         try:
             # Determine typical trace width (most common value)
             if not trace_widths:
@@ -961,9 +1182,9 @@ class EtchingValidator:
             # Look for segments with larger radius (contact pads)
             # Contact pads should have radius >= 2x typical trace width
             pad_threshold = typical_width * 1.8  # Allow some tolerance
-            contact_pads = [s for s in segments if s[4] >= pad_threshold]
+            pad_radii = [w for w in trace_widths if w >= pad_threshold]
 
-            pad_count = len(contact_pads)
+            pad_count = len(pad_radii)
             has_contact_pads = pad_count > 0
 
             # Validate pad size
@@ -972,7 +1193,6 @@ class EtchingValidator:
 
             if has_contact_pads:
                 # Calculate average pad radius
-                pad_radii = [s[4] for s in contact_pads]
                 avg_pad_radius = sum(pad_radii) / len(pad_radii)
                 ratio = avg_pad_radius / typical_width
 
@@ -993,67 +1213,70 @@ class EtchingValidator:
 
     @staticmethod
     def _calculate_dimensions(segments):
-        """Calculate total width and height of geometry."""
-        if not segments:
+        """Calculate total width and height of geometry (list of 5-tuples or (N, 5) array)."""
+        if len(segments) == 0:
             return {'width': 0, 'height': 0}
-            
-        x_coords = []
-        y_coords = []
-        for x1, y1, x2, y2, _ in segments:
-            x_coords.extend([x1, x2])
-            y_coords.extend([y1, y2])
-            
+
+        min_x, min_y, max_x, max_y, _, _ = segment_extents(
+            np.asarray(segments, dtype=np.float64).reshape(-1, 5))
         return {
-            'width': max(x_coords) - min(x_coords),
-            'height': max(y_coords) - min(y_coords)
+            'width': max_x - min_x,
+            'height': max_y - min_y
         }
 
     @staticmethod
     def _check_connectivity(segments):
-        """Analyze connectivity of wire segments."""
-        if not segments:
+        """Analyze connectivity of wire segments (list of 5-tuples or (N, 5) array)."""
+        if len(segments) == 0:
             return {'components': 0, 'isolated_segments': 0}
-            
-        # Build adjacency graph
-        adj = {}
-        
-        def add_node(pt):
-            # Round coordinates to avoid float precision issues
-            key = (round(pt[0], 4), round(pt[1], 4))
-            if key not in adj: adj[key] = []
-            return key
-
-        for x1, y1, x2, y2, _ in segments:
-            p1 = add_node((x1, y1))
-            p2 = add_node((x2, y2))
-            adj[p1].append(p2)
-            adj[p2].append(p1)
-            
-        # Count connected components
-        visited = set()
-        components = 0
-        isolated_count = 0
-        
-        for node in adj:
-            if node not in visited:
-                components += 1
-                # BFS to find component size
-                component_nodes = 0
-                queue = [node]
-                visited.add(node)
-                while queue:
-                    curr = queue.pop(0)
-                    component_nodes += 1
-                    for neighbor in adj[curr]:
-                        if neighbor not in visited:
-                            visited.add(neighbor)
-                            queue.append(neighbor)
-                
-                # Check if isolated (2 nodes connected to each other only, i.e. 1 segment)
-                # Actually, a single segment has 2 nodes. Component size 2 = 1 segment.
-                if component_nodes <= 2:
-                    isolated_count += 1
-                    
+
+        # Endpoints as fixed-point integers (0.0001" units) so nearly coincident
+        # points share a key and hashing works on ints instead of floats
+        coords = np.asarray(segments, dtype=np.float64).reshape(-1, 5)[:, :4]
+        keys = np.rint(coords * CONNECTIVITY_KEY_SCALE).astype(np.int64)
+
+        # Results are memoized per endpoint layout; hand back a copy
+        return dict(EtchingValidator._connectivity_summary(keys.tobytes()))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _connectivity_summary(key_bytes: bytes) -> Dict:
+        """Count connected components and isolated single-segment wires.
+
+        ``key_bytes`` holds an int64 (N, 4) array of fixed-point endpoint keys.
+        Endpoints are merged with a union-find (union by size, path compression);
+        isolated wires are components that own exactly one segment.
+        """
+        # Number the distinct endpoints 0..M-1 in one vectorized pass, so the
+        # union-find runs on list indices rather than hashing coordinate tuples
+        points = np.frombuffer(key_bytes, dtype=np.int64).reshape(-1, 2)
+        unique_points, node_ids = np.unique(points, axis=0, return_inverse=True)
+        node_count = len(unique_points)
+        parent = list(range(node_count))
+        size = [1] * node_count  # endpoint count per root
+
+        def find(node):
+            root = node
+            while parent[root] != root:
+                root = parent[root]
+            while parent[node] != root:
+                parent[node], node = root, parent[node]
+            return root
+
+        segment_nodes = node_ids.reshape(-1, 2).tolist()
+        for p1, p2 in segment_nodes:
+            r1, r2 = find(p1), find(p2)
+            if r1 != r2:
+                if size[r1] < size[r2]:
+                    r1, r2 = r2, r1
+                parent[r2] = r1
+                size[r1] += size[r2]
+
+        components = sum(1 for node, up in enumerate(parent) if up == node)
+        # A component is isolated when exactly one segment belongs to it
+        segments_per_root = np.bincount([find(p1) for p1, _ in segment_nodes], minlength=node_count)
+        isolated_count = int((segments_per_root == 1).sum())
+
         return {
             'components': components,
             'isolated_segments': isolated_count
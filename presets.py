@@ -1,4 +1,5 @@
 """Frequency band presets for tri-band antenna design."""
+import functools
 from typing import Dict, List, Tuple, Optional
 from enum import Enum
 from loguru import logger
@@ -68,6 +69,17 @@ class BandPresets:
     @staticmethod
     def get_all_bands() -> Dict[str, FrequencyBand]:
         """Return all predefined frequency bands."""
+        return dict(BandPresets._preset_catalog())
+
+    @staticmethod
+    def get(key: str) -> FrequencyBand:
+        """Return one predefined band by key (KeyError if unknown)."""
+        return BandPresets._preset_catalog()[key]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _preset_catalog() -> Dict[str, FrequencyBand]:
+        """Build the preset catalog once per process. Do not mutate the result."""
         return {
             # TV Broadcast Bands (VHF/UHF)
             'tv_vhf_low': FrequencyBand(
@@ -158,7 +170,7 @@ class BandPresets:
     @staticmethod
     def get_bands_by_type(band_type: BandType) -> List[FrequencyBand]:
         """Get all bands of a specific type."""
-        all_bands = BandPresets.get_all_bands()
+        all_bands = BandPresets._preset_catalog()
         return [band for band in all_bands.values() if band.band_type == band_type]
 
     @staticmethod
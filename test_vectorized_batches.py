@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Regression tests for the NumPy/Numba batch paths, their scalar counterparts and the cached lookups."""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import matplotlib
+import numpy as np
+from loguru import logger
+
+import antenna_kernels
+from band_chart import BandAnalysisChart
+from constraints import ElectricalConstraints, MATCH_UNDEFINED, SubstrateConstraints
+from core import NEC2Interface
+from design import AdvancedMeanderTrace
+from export import EtchingValidator, VectorExporter
+from presets import BandPresets
+
+
+def test_gw_cards_need_nine_tokens():
+    """GW cards that stop at y2 (8 tokens) are rejected, not reshaped into other rows."""
+    print("Testing batch GW parse with 8-token cards...")
+    exporter = VectorExporter(output_dir=tempfile.mkdtemp())
+
+    # 9 cards x 8 values is divisible by 9, so a blind reshape would "succeed"
+    short_cards = '\n'.join(f"GW {i} 1 {i} 0 0 {i}.5 0" for i in range(1, 10))
+    assert exporter._parse_geometry(short_cards) == []
+
+    # One short card must not take the well-formed cards down with it
+    mixed = short_cards + "\nGW 20 1 0 0 0 1 1 0 0.002\nGW 21 1 1 1 0 2 1 0"
+    assert exporter._parse_geometry(mixed) == [(0.0, 0.0, 1.0, 1.0, 0.002), (1.0, 1.0, 2.0, 1.0, exporter.min_trace_width)]
+    print("✅ 8-token GW cards are skipped")
+
+
+def test_etching_validation_copies_are_independent():
+    """Each validate_for_etching result can be edited like the old dict without touching the memoized one."""
+    print("Testing etching validation copies...")
+    geometry = '\n'.join(f"GW {i} 1 {i * 0.1:.1f} 0 0 {i * 0.1 + 0.1:.1f} 0 0 0.006" for i in range(12))
+    first = EtchingValidator.validate_for_etching(geometry)
+    assert first.validated
+
+    assert first['minimum_feature_size']
+    first['minimum_feature_size'] = False
+    first['warnings'].append("edited by caller")
+    try:
+        first['not_a_field'] = 1
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown keys cannot be added")
+
+    second = EtchingValidator.validate_for_etching(geometry)
+    assert second.minimum_feature_size and not first.minimum_feature_size
+    assert "edited by caller" not in second['warnings']
+    assert list(second) == list(second.keys()) and dict(second.items()) == second.as_dict()
+    print("✅ Validation copies are independent")
+
+
+def test_etching_validation_errors_are_not_cached():
+    """A validation that fails is reported but retried on the next call for the same geometry."""
+    print("Testing that failed etching validations are not memoized...")
+    geometry = "GW 1 1 0 0 0 1 0 0 0.006\nGW 2 1 1 0 0 1 1 0 0.006\nGW 99 1 9 9 0 9.5 9 0 0.006"
+    parse = VectorExporter._parse_geometry_array
+
+    def failing_parse(self, geometry):
+        raise MemoryError("transient")
+
+    VectorExporter._parse_geometry_array = failing_parse
+    try:
+        failed = EtchingValidator.validate_for_etching(geometry)
+    finally:
+        VectorExporter._parse_geometry_array = parse
+    assert not failed.validated and not failed.etching_ready
+    assert failed.warnings == ["Validation error: transient"]
+
+    retried = EtchingValidator.validate_for_etching(geometry)
+    assert retried.validated and retried.element_count == 3
+    print("✅ Failed validations are retried")
+
+
+def test_connectivity_merges_nearby_endpoints():
+    """The union-find connectivity check joins endpoints within 0.0001" and counts isolated wires."""
+    print("Testing etching connectivity...")
+    segments = [
+        (0.0, 0.0, 1.0, 0.0, 0.001),
+        (1.00004, 0.0, 1.0, 1.0, 0.001),   # meets the first wire within 0.0001"
+        (3.0, 3.0, 4.0, 3.0, 0.001),       # isolated wire
+    ]
+    for layout in (segments, np.array(segments)):
+        connectivity = EtchingValidator._check_connectivity(layout)
+        assert connectivity == {'components': 2, 'isolated_segments': 1}
+    print("✅ Connectivity check merges nearby endpoints")
+
+
+def test_impedance_matching_batch_matches_scalar():
+    """The batch impedance check agrees with the scalar one across a sweep, including 0, target and -target."""
+    print("Testing batch impedance matching against the scalar check...")
+    target = 50.0
+    sweep = np.concatenate([
+        [0.0, target, -target],
+        np.linspace(1.0, 500.0, 97) + 1j * np.linspace(-120.0, 120.0, 97),
+    ])
+    batch = ElectricalConstraints.check_impedance_matching_batch(sweep, target)
+
+    for i, z in enumerate(sweep):
+        scalar = ElectricalConstraints.check_impedance_matching(complex(z), target)
+        if z == -target:
+            # No reflection coefficient: both report the division error
+            assert batch['assessment'][i] == scalar['assessment'] == MATCH_UNDEFINED
+            assert not batch['is_matched'][i]
+            assert np.isnan(batch['reflection_coefficient'][i])
+            assert np.isnan(batch['vswr'][i]) and np.isnan(batch['return_loss_db'][i])
+        elif z == 0:
+            # Total mismatch: the scalar check errors on the VSWR, the batch documents it as infinite
+            assert scalar['assessment'].startswith('error')
+            assert batch['reflection_coefficient'][i] == scalar['reflection_coefficient'] == 1.0
+            assert np.isinf(batch['vswr'][i])
+            assert batch['assessment'][i] == 'poor' and not batch['is_matched'][i]
+        else:
+            assert batch['assessment'][i] == scalar['assessment']
+            assert batch['is_matched'][i] == scalar['is_matched']
+            for key in ('reflection_coefficient', 'vswr', 'return_loss_db'):
+                assert np.isclose(batch[key][i], scalar[key], rtol=1e-12), (key, z)
+    print("✅ Batch and scalar impedance checks agree")
+
+
+def test_point_validity_batch_matches_scalar():
+    """is_point_valid_batch agrees with is_point_valid, including points on the usable-area edges."""
+    print("Testing batch point validity against the scalar check...")
+    substrate = SubstrateConstraints(4.0, 2.0)
+    edges_x = [substrate._xlo, substrate._xhi]
+    edges_y = [substrate._ylo, substrate._yhi]
+    xs = np.concatenate([np.linspace(-2.5, 2.5, 41), edges_x, np.nextafter(edges_x, [-np.inf, np.inf]), [np.nan]])
+    ys = np.concatenate([np.linspace(-1.5, 1.5, 41), edges_y, [0.0, 0.0], [0.0]])
+
+    batch = substrate.is_point_valid_batch(xs, ys)
+    assert batch.dtype == bool
+    assert batch.tolist() == [substrate.is_point_valid(x, y) for x, y in zip(xs.tolist(), ys.tolist())]
+    print("✅ Batch and scalar point checks agree")
+
+
+def test_target_length_batch_matches_scalar():
+    """extract_target_length_batch reproduces the scalar helper exactly, with 0.0 for non-positive frequencies."""
+    print("Testing batch target lengths against the scalar helper...")
+    meander = AdvancedMeanderTrace(4.0, 2.0)
+    frequencies = np.array([54.0, 72.0, 88.5, 470.0, 915.0, 2400.0, 2437.5, 5800.0, 0.0, -5.0])
+
+    batch = meander.extract_target_length_batch(frequencies)
+    assert batch.tolist() == [meander.extract_target_length(f) for f in frequencies.tolist()]
+
+    # Other coupling factors follow calculate_target_length the same way
+    batch = meander.extract_target_length_batch(frequencies, kc=0.85)
+    assert batch.tolist() == [meander.calculate_target_length(f * 1e6, 1.0, 0.85) * 39.3701
+                              for f in frequencies.tolist()]
+    print("✅ Batch and scalar target lengths agree")
+
+
+def test_band_lengths_keep_list_fields():
+    """The legacy per-row electrical length keys stay plain lists alongside the (3, N) array."""
+    print("Testing band length result types...")
+    chart = BandAnalysisChart(4.0, 2.0)
+    result = chart.calculate_band_lengths(BandPresets.get('wifi_2g_extend'), fast=True)
+
+    rows = result['electrical_lengths']
+    assert isinstance(rows, np.ndarray) and rows.shape == (3, result['band_count'])
+    for row, key in enumerate(('electrical_lengths_quarter', 'electrical_lengths_half', 'electrical_lengths_full')):
+        assert type(result[key]) is list and result[key]
+        assert result[key] == rows[row].tolist()
+        json.dumps(result[key])
+    print("✅ Legacy electrical length keys are lists")
+
+
+def test_combined_chart_writes_both_charts():
+    """create_combined_chart saves the preset and custom charts, and reports a missing custom chart as ""."""
+    print("Testing combined preset/custom chart generation...")
+    out_dir = tempfile.mkdtemp()
+    chart = BandAnalysisChart(4.0, 2.0)
+    custom_bands = {'custom': BandPresets.create_custom_band('Custom', 433.0, 915.0, 2400.0)}
+    preset_file = os.path.join(out_dir, 'presets.png')
+    custom_file = os.path.join(out_dir, 'custom.png')
+
+    rc_before = dict(matplotlib.rcParams)
+    paths = chart.create_combined_chart(custom_bands, preset_file, custom_file, fast=True, dpi=40)
+    assert paths == (preset_file, custom_file)
+    # Chart render settings are scoped to the save, not left in the global rcParams
+    assert dict(matplotlib.rcParams) == rc_before
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+    preset_path, custom_path = chart.create_combined_chart({}, preset_file, custom_file, fast=True, dpi=40)
+    assert preset_path == preset_file and custom_path == ""
+    print("✅ Combined charts written")
+
+
+def test_band_preset_lookup():
+    """BandPresets.get returns the catalog entry, and get_all_bands hands out an independent dict."""
+    print("Testing band preset lookup...")
+    all_bands = BandPresets.get_all_bands()
+    for key, band in all_bands.items():
+        assert BandPresets.get(key) is band
+
+    try:
+        BandPresets.get('no_such_band')
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown band key should raise KeyError")
+
+    # Callers may edit their copy without touching the shared catalog
+    all_bands.pop('wifi_2g_extend')
+    all_bands['extra'] = BandPresets.create_custom_band('Extra', 100.0, 200.0, 300.0)
+    fresh = BandPresets.get_all_bands()
+    assert 'wifi_2g_extend' in fresh and 'extra' not in fresh
+    assert BandPresets.get('wifi_2g_extend').frequencies == fresh['wifi_2g_extend'].frequencies
+    print("✅ Band preset lookup works")
+
+
+def _both_kernel_paths(kernel, *args):
+    """Run a kernel with Numba (when installed) and with its NumPy fallback."""
+    compiled = kernel(*args)
+    numba_available = antenna_kernels.NUMBA_AVAILABLE
+    antenna_kernels.NUMBA_AVAILABLE = False
+    try:
+        fallback = kernel(*args)
+    finally:
+        antenna_kernels.NUMBA_AVAILABLE = numba_available
+    return compiled, fallback
+
+
+def test_vswr_kernel_paths_agree():
+    """vswr_from_reflection agrees with and without Numba, inf for |Γ| >= 1."""
+    print("Testing VSWR kernel paths...")
+    rng = np.random.default_rng(7)
+    gammas = np.concatenate([
+        [0.0, 0.5, -0.5j, 1.0, -1.0, 1j, 0.6 + 0.8j, 1.5],
+        rng.uniform(-1.0, 1.0, 200) + 1j * rng.uniform(-1.0, 1.0, 200),
+    ])
+
+    compiled, fallback = _both_kernel_paths(antenna_kernels.vswr_from_reflection, gammas)
+    # |Γ| may differ in the last bit between Numba's and NumPy's complex abs
+    assert np.allclose(compiled, fallback, rtol=1e-12, atol=0.0)
+    assert np.isinf(compiled[np.abs(gammas) >= 1.0]).all()
+    assert compiled[0] == 1.0 and np.isclose(compiled[1], 3.0)
+    print("✅ VSWR kernel paths agree")
+
+
+def test_wire_direction_kernel_paths_agree():
+    """wire_directions gives identical lengths and WIRE_* codes with and without Numba."""
+    print("Testing wire direction kernel paths...")
+    rng = np.random.default_rng(11)
+    coords = rng.uniform(-2.0, 2.0, (3000, 4))
+    coords[::3, 3] = coords[::3, 1] + 0.005      # horizontal, within tolerance
+    coords[1::3, 2] = coords[1::3, 0]            # vertical
+    coords[2::6, 3] = coords[2::6, 1] + 0.01     # right at the tolerance
+
+    (lengths, directions), (fb_lengths, fb_directions) = _both_kernel_paths(antenna_kernels.wire_directions, coords)
+    assert np.array_equal(lengths, fb_lengths)
+    assert np.array_equal(directions, fb_directions)
+    assert directions.dtype == fb_directions.dtype == np.int8
+    assert (directions[::3] == antenna_kernels.WIRE_HORIZONTAL).all()
+    assert set(np.unique(directions).tolist()) == {antenna_kernels.WIRE_HORIZONTAL, antenna_kernels.WIRE_VERTICAL,
+                                                   antenna_kernels.WIRE_DIAGONAL}
+
+    empty_lengths, empty_directions = antenna_kernels.wire_directions(np.empty((0, 4)))
+    assert empty_lengths.shape == empty_directions.shape == (0,)
+    print("✅ Wire direction kernel paths agree")
+
+
+def test_nec2_discovery_retries_after_a_miss():
+    """A failed NEC2 lookup is not remembered, so a solver added to PATH later is found."""
+    print("Testing NEC2 discovery caching...")
+    if os.name != 'posix':
+        print("   (skipped: the stand-in solver is a shell script)")
+        return
+    search_dir = tempfile.mkdtemp()
+    saved_path = os.environ.get('PATH', '')
+    NEC2Interface.clear_discovery_cache()
+    try:
+        os.environ['PATH'] = search_dir
+        if NEC2Interface._discover_nec2() is not None:
+            print("   (a well-known NEC2 install exists here; nothing to retry)")
+            return
+
+        solver = os.path.join(search_dir, 'nec2')
+        with open(solver, 'w') as f:
+            f.write('#!/bin/sh\n')
+        os.chmod(solver, 0o755)
+        assert NEC2Interface._discover_nec2() == solver
+
+        # A hit is remembered until the cache is cleared
+        os.remove(solver)
+        assert NEC2Interface._discover_nec2() == solver
+        NEC2Interface.clear_discovery_cache()
+        assert NEC2Interface._discover_nec2() is None
+    finally:
+        os.environ['PATH'] = saved_path
+        NEC2Interface.clear_discovery_cache()
+    print("✅ NEC2 discovery retries after a miss")
+
+
+def main():
+    """Run all tests."""
+    print("Vectorized Batch Test Suite")
+    print("=" * 60)
+    logger.remove()
+
+    test_gw_cards_need_nine_tokens()
+    test_etching_validation_copies_are_independent()
+    test_etching_validation_errors_are_not_cached()
+    test_connectivity_merges_nearby_endpoints()
+    test_impedance_matching_batch_matches_scalar()
+    test_point_validity_batch_matches_scalar()
+    test_target_length_batch_matches_scalar()
+    test_band_lengths_keep_list_fields()
+    test_combined_chart_writes_both_charts()
+    test_band_preset_lookup()
+    test_vswr_kernel_paths_agree()
+    test_wire_direction_kernel_paths_agree()
+    test_nec2_discovery_retries_after_a_miss()
+
+    print("\n" + "=" * 60)
+    print("✅ All batch tests passed!")
+
+
+if __name__ == "__main__":
+    main()
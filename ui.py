@@ -3072,7 +3072,7 @@ Click OK to continue with an empty design library.
             substrate_height = float(self.substrate_height_var.get())
 
             # Import the chart module here to avoid circular imports
-            from band_chart import BandAnalysisChart
+            from band_chart import BandAnalysisChart, EXPORT_CHART_DPI
             from presets import BandPresets
 
             # Create chart analyzer
@@ -3156,23 +3156,26 @@ Click OK to continue with an empty design library.
                 # Generate detailed chart for a specific band
                 if custom_bands and len(custom_bands) == 1:
                     band_name = list(custom_bands.keys())[0]
-                    chart_path = chart.create_detailed_band_chart(band_name, "band_analysis_detailed.png")
+                    chart_path = chart.create_detailed_band_chart(band_name, "band_analysis_detailed.png",
+                                                                  dpi=EXPORT_CHART_DPI)
                 else:
                     # Fallback to first available band
                     all_bands = BandPresets.get_all_bands()
                     if all_bands:
                         first_band_key = list(all_bands.keys())[0]
-                        chart_path = chart.create_detailed_band_chart(first_band_key, "band_analysis_detailed.png")
+                        chart_path = chart.create_detailed_band_chart(first_band_key, "band_analysis_detailed.png",
+                                                                      dpi=EXPORT_CHART_DPI)
                     else:
                         self._show_error("No frequency bands available for detailed analysis")
                         return
             else:
                 # Generate custom comparison chart (focused on current frequencies)
                 if custom_bands:
-                    chart_path = chart.create_custom_comparison_chart(custom_bands, "band_analysis.png")
+                    chart_path = chart.create_custom_comparison_chart(custom_bands, "band_analysis.png",
+                                                                      dpi=EXPORT_CHART_DPI)
                 else:
                     # Fallback to showing all bands
-                    chart_path = chart.create_comparison_chart("band_analysis.png")
+                    chart_path = chart.create_comparison_chart("band_analysis.png", dpi=EXPORT_CHART_DPI)
 
             if chart_path and os.path.exists(chart_path):
                 # Display the chart in the UI using matplotlib embedded in tkinter
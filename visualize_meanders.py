@@ -5,11 +5,26 @@ Meander Pattern Visualization and Debugging Tool
 Provides ASCII art and simple SVG visualization to verify meander patterns.
 """
 
-import math
 import sys
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
+import numpy as np
+from scipy.spatial import cKDTree
 from loguru import logger
 
+from antenna_kernels import (NUMBA_AVAILABLE, PARALLEL_MIN_SEGMENTS, count_horizontal,
+                             counts_to_chars, rasterize_segments)
+
+# Column layout of the segment arrays built by MeanderVisualizer.segments_to_array
+X1, Y1, X2, Y2, RADIUS = range(5)
+
+# Squared distance thresholds (compare against dx*dx + dy*dy, no sqrt needed)
+GAP_TOLERANCE_SQ = 0.01 * 0.01   # endpoint gap between consecutive segments
+FEED_TOLERANCE_SQ = 0.01 * 0.01  # intersections this close to (0, 0) are the feed
+
+# Below this many segments, candidate intersection pairs come from a dense
+# distance matrix instead of a KD-tree
+BROADCAST_MAX_SEGMENTS = 500
+
 class MeanderVisualizer:
     """Visualize meander and spiral antenna patterns for debugging."""
     
@@ -31,7 +46,8 @@ class MeanderVisualizer:
         lines = geometry.split('\n')
         
         for line in lines:
-            if not line.strip():
+            # Only GW cards carry segments; skip CM/GE/blank lines before tokenizing
+            if line.lstrip()[:2] != 'GW':
                 continue
                 
             parts = line.split()
@@ -54,6 +70,16 @@ class MeanderVisualizer:
                     
         logger.info(f"Parsed {len(segments)} segments from geometry")
         return segments
+
+    @staticmethod
+    def segments_to_array(segments: List[Dict[str, Any]]) -> np.ndarray:
+        """Pack segment dictionaries into an (N, 5) array of x1, y1, x2, y2, radius.
+
+        Analysis and rendering work on the array columns instead of
+        re-reading every dictionary per pass.
+        """
+        return np.array([(seg['x1'], seg['y1'], seg['x2'], seg['y2'], seg.get('radius', 0.010))
+                         for seg in segments], dtype=np.float64).reshape(-1, 5)
     
     def analyze_pattern(self, segments: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze the meander pattern characteristics.
@@ -67,27 +93,20 @@ class MeanderVisualizer:
         if not segments:
             return {'error': 'No segments to analyze'}
         
-        # Calculate bounds
-        all_x = []
-        all_y = []
-        total_length = 0.0
-        
-        for seg in segments:
-            all_x.extend([seg['x1'], seg['x2']])
-            all_y.extend([seg['y1'], seg['y2']])
-            
-            # Calculate segment length
-            seg_length = math.sqrt((seg['x2']-seg['x1'])**2 + (seg['y2']-seg['y1'])**2)
-            total_length += seg_length
-        
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
+        return self._analyze_coords(segments, self.segments_to_array(segments))
+    
+    def _analyze_coords(self, segments: List[Dict[str, Any]], coords: np.ndarray) -> Dict[str, Any]:
+        """analyze_pattern body for a non-empty pattern whose array is already built."""
+        stats = self.segment_stats(coords)
+        min_x, max_x = stats['min_x'], stats['max_x']
+        min_y, max_y = stats['min_y'], stats['max_y']
+        total_length = stats['total_length']
         
         # Analyze pattern type
-        pattern_type = self._detect_pattern_type(segments)
+        pattern_type = self._detect_pattern_type(len(coords), stats['horizontal'], stats['vertical'])
         
         # Check for connectivity issues
-        connectivity_issues = self._check_connectivity(segments)
+        connectivity_issues = self._check_connectivity(segments, coords)
         
         # Calculate space utilization
         substrate_area = (max_x - min_x) * (max_y - min_y)
@@ -111,25 +130,41 @@ class MeanderVisualizer:
         
         return analysis
     
-    def _detect_pattern_type(self, segments: List[Dict[str, Any]]) -> str:
-        """Detect the type of meander pattern."""
-        if len(segments) < 3:
+    @staticmethod
+    def segment_stats(coords: np.ndarray) -> Dict[str, Any]:
+        """Compute bounds, trace length and orientation counts in one pass.
+
+        Args:
+            coords: (N, 5) array from segments_to_array (N >= 1)
+
+        Returns:
+            Dictionary with min/max x and y, total_length, and horizontal and
+            vertical segment counts
+        """
+        dx = coords[:, X2] - coords[:, X1]
+        dy = coords[:, Y2] - coords[:, Y1]
+        xs = coords[:, [X1, X2]]
+        ys = coords[:, [Y1, Y2]]
+
+        if NUMBA_AVAILABLE and len(coords) >= PARALLEL_MIN_SEGMENTS:
+            horizontal = int(count_horizontal(coords))
+        else:
+            horizontal = int((np.abs(dx) > np.abs(dy)).sum())
+
+        return {
+            'min_x': float(xs.min()), 'max_x': float(xs.max()),
+            'min_y': float(ys.min()), 'max_y': float(ys.max()),
+            'total_length': float(np.hypot(dx, dy).sum()),
+            'horizontal': horizontal,
+            'vertical': len(coords) - horizontal,
+        }
+    
+    def _detect_pattern_type(self, segment_count: int,
+                             horizontal_segments: int, vertical_segments: int) -> str:
+        """Detect the type of meander pattern from its orientation counts."""
+        if segment_count < 3:
             return "insufficient_segments"
         
-        # Count direction changes
-        direction_changes = 0
-        horizontal_segments = 0
-        vertical_segments = 0
-        
-        for i, seg in enumerate(segments):
-            dx = seg['x2'] - seg['x1']
-            dy = seg['y2'] - seg['y1']
-            
-            if abs(dx) > abs(dy):
-                horizontal_segments += 1
-            else:
-                vertical_segments += 1
-        
         # Determine pattern type
         if horizontal_segments > vertical_segments * 2:
             return "horizontal_dominant"
@@ -142,47 +177,63 @@ class MeanderVisualizer:
         else:
             return "unknown_pattern"
     
-    def _check_connectivity(self, segments: List[Dict[str, Any]]) -> List[str]:
-        """Check for connectivity issues in the pattern."""
+    def _check_connectivity(self, segments: List[Dict[str, Any]],
+                            coords: Optional[np.ndarray] = None) -> List[str]:
+        """Check for connectivity issues in the pattern.
+
+        ``coords`` may pass in an already-built segments_to_array result.
+        """
         issues = []
+        if coords is None:
+            coords = self.segments_to_array(segments)
         
-        # Build connectivity map
-        connections = {}
-        for i, seg in enumerate(segments):
-            start = (seg['x1'], seg['y1'])
-            end = (seg['x2'], seg['y2'])
-            
-            if i not in connections:
-                connections[i] = {'starts': [], 'ends': []}
-            connections[i]['starts'].append(start)
-            connections[i]['ends'].append(end)
-        
-        # Check for gaps
-        for i, seg in enumerate(segments):
-            if i < len(segments) - 1:
-                current_end = (seg['x2'], seg['y2'])
-                next_start = (segments[i+1]['x1'], segments[i+1]['y1'])
-                
-                distance = math.sqrt((current_end[0]-next_start[0])**2 + (current_end[1]-next_start[1])**2)
-                if distance > 0.01:  # More than 0.01 inch gap
-                    issues.append(f"gap_between_segments_{i+1}_{i+2}")
+        # Check for gaps between consecutive segments
+        gx = coords[1:, X1] - coords[:-1, X2]
+        gy = coords[1:, Y1] - coords[:-1, Y2]
+        for i in np.flatnonzero(gx*gx + gy*gy > GAP_TOLERANCE_SQ):  # More than 0.01 inch gap
+            issues.append(f"gap_between_segments_{i+1}_{i+2}")
         
         # Check for intersections (except at feed point)
-        for i, seg1 in enumerate(segments):
-            for j, seg2 in enumerate(segments):
-                if i >= j:  # Don't compare with self or previous segments
-                    continue
-                
-                # Check if segments intersect
-                if self._segments_intersect(seg1, seg2):
-                    # Check if intersection is at feed point (0,0)
-                    intersection = self._find_intersection(seg1, seg2)
-                    if intersection:
-                        dist_to_feed = math.sqrt(intersection[0]**2 + intersection[1]**2)
-                        if dist_to_feed > 0.01:  # Not at feed point
-                            issues.append(f"short_circuit_segments_{i+1}_{j+1}")
+        for i, j in self._candidate_pairs(coords):
+            seg1, seg2 = segments[i], segments[j]
+            
+            # Check if segments intersect
+            if self._segments_intersect(seg1, seg2):
+                # Check if intersection is at feed point (0,0)
+                intersection = self._find_intersection(seg1, seg2)
+                if intersection:
+                    ix, iy = intersection
+                    if ix*ix + iy*iy > FEED_TOLERANCE_SQ:  # Not at feed point
+                        issues.append(f"short_circuit_segments_{i+1}_{j+1}")
         
         return issues
+
+    @staticmethod
+    def _candidate_pairs(coords: np.ndarray) -> List[Tuple[int, int]]:
+        """Return (i, j) pairs, i < j in sorted order, of segments that may intersect.
+
+        Two segments can only touch if their midpoints are within half the sum
+        of their lengths, so a KD-tree radius query on midpoints (radius = the
+        longest segment) replaces the all-pairs scan. Small patterns use a
+        broadcast distance matrix instead of the tree.
+        """
+        if len(coords) < 2:
+            return []
+        
+        midpoints = (coords[:, [X1, Y1]] + coords[:, [X2, Y2]]) / 2
+        lengths = np.hypot(coords[:, X2] - coords[:, X1], coords[:, Y2] - coords[:, Y1])
+        reach = float(lengths.max()) * (1 + 1e-9) + 1e-12
+        
+        if len(coords) < BROADCAST_MAX_SEGMENTS:
+            # Small patterns: one broadcast distance matrix beats building a tree
+            diff = midpoints[:, None, :] - midpoints[None, :, :]
+            near = np.einsum('ijk,ijk->ij', diff, diff) <= reach * reach
+            rows, cols = np.nonzero(np.triu(near, k=1))  # row-major, so already sorted
+            return list(zip(rows.tolist(), cols.tolist()))
+        
+        pairs = cKDTree(midpoints).query_pairs(reach, output_type='ndarray')
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        return [(int(i), int(j)) for i, j in pairs]
     
     def _segments_intersect(self, seg1: Dict, seg2: Dict) -> bool:
         """Check if two line segments intersect."""
@@ -233,52 +284,34 @@ class MeanderVisualizer:
         if not segments:
             return "No segments to render"
         
-        # Calculate bounds and scaling
-        all_x = []
-        all_y = []
-        for seg in segments:
-            all_x.extend([seg['x1'], seg['x2']])
-            all_y.extend([seg['y1'], seg['y2']])
-        
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
+        # Analyze once; the header and the scaling share the same bounds
+        coords = self.segments_to_array(segments)
+        analysis = self._analyze_coords(segments, coords)
+        bounds = analysis['bounds']
+        min_x, max_x = bounds['min_x'], bounds['max_x']
+        min_y, max_y = bounds['min_y'], bounds['max_y']
         
-        # Create ASCII canvas
-        canvas = [[' ' for _ in range(width)] for _ in range(height)]
+        # Scale all endpoints to canvas cells at once
+        gx = self._scale_to_grid(coords[:, [X1, X2]], min_x, max_x, width)
+        gy = self._scale_to_grid(coords[:, [Y1, Y2]], min_y, max_y, height)
         
-        # Scaling function
-        def scale_x(x):
-            return int((x - min_x) / (max_x - min_x + 0.001) * (width - 4)) + 2
-        
-        def scale_y(y):
-            return int((y - min_y) / (max_y - min_y + 0.001) * (height - 4)) + 2
-        
-        # Draw segments
-        for seg in segments:
-            x1, y1 = scale_x(seg['x1']), scale_y(seg['y1'])
-            x2, y2 = scale_x(seg['x2']), scale_y(seg['y2'])
-            
-            # Draw line using Bresenham's algorithm
-            points = self._get_line_points(x1, y1, x2, y2)
-            for px, py in points:
-                if 0 <= px < width and 0 <= py < height:
-                    if canvas[py][px] == ' ':
-                        canvas[py][px] = '#'
-                    elif canvas[py][px] == '#':
-                        canvas[py][px] = '+'  # Intersection point
+        # Draw segments as overdraw counts, then map to characters
+        # ('#' for a trace, '+' where traces meet or cross)
+        counts = np.zeros((height, width), dtype=np.uint8)
+        points = np.column_stack((gx[:, 0], gy[:, 0], gx[:, 1], gy[:, 1]))
+        rasterize_segments(points, counts)
+        canvas = counts_to_chars(counts)
         
         # Mark feed point
-        feed_x, feed_y = scale_x(0), scale_y(0)
+        feed_x = int(self._scale_to_grid(np.float64(0), min_x, max_x, width))
+        feed_y = int(self._scale_to_grid(np.float64(0), min_y, max_y, height))
         if 0 <= feed_x < width and 0 <= feed_y < height:
-            canvas[feed_y][feed_x] = 'F'
+            canvas[feed_y, feed_x] = ord('F')
         
         # Convert to string
-        ascii_art = []
-        for row in canvas:
-            ascii_art.append(''.join(row))
+        ascii_art = [row.tobytes().decode('ascii') for row in canvas]
         
         # Add header with analysis
-        analysis = self.analyze_pattern(segments)
         header = f"""
 MEANDER PATTERN VISUALIZATION
 ===========================
@@ -294,29 +327,10 @@ Legend: # = Trace, F = Feed Point, + = Intersection
 """
         return header + '\n'.join(ascii_art)
     
-    def _get_line_points(self, x1: int, y1: int, x2: int, y2: int) -> List[Tuple[int, int]]:
-        """Get all points on a line using Bresenham's algorithm."""
-        points = []
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        sx = 1 if x1 < x2 else -1
-        sy = 1 if y1 < y2 else -1
-        err = dx - dy
-        
-        x, y = x1, y1
-        while True:
-            points.append((x, y))
-            if x == x2 and y == y2:
-                break
-            e2 = 2 * err
-            if e2 > -dy:
-                err -= dy
-                x += sx
-            if e2 < dx:
-                err += dx
-                y += sy
-        
-        return points
+    @staticmethod
+    def _scale_to_grid(values: np.ndarray, lo: float, hi: float, cells: int) -> np.ndarray:
+        """Map coordinates in [lo, hi] to canvas cells, leaving a 2-cell border."""
+        return ((values - lo) / (hi - lo + 0.001) * (cells - 4)).astype(np.int64) + 2
     
     def generate_debug_svg(self, segments: List[Dict[str, Any]], 
                        filename: str = "debug_meander.svg") -> str: